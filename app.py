@@ -1,18 +1,26 @@
 from __future__ import annotations
 
+import atexit
 import importlib
 import json
+import mmap
 import os
 import tempfile
 import threading
 import time
 import uuid
-from datetime import datetime, timedelta, date
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, date
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
 
 import hashlib
+import heapq
+import re
+import sys
 
-from flask import Flask, jsonify, render_template, request
+from flask import Flask, render_template, request
+from flask.json.provider import DefaultJSONProvider
 
 from flask import abort
 
@@ -27,6 +35,11 @@ else:
 INDEX_FILE = os.path.join(DATA_ROOT, "index.json")
 VALID_LIST_TYPES = ("A", "B", "PA", "PB")
 VALID_LIST_TYPES_SET = set(VALID_LIST_TYPES)
+# Comma/whitespace separated tickers; keeps ^, = and - so index and futures symbols survive
+_SYMBOL_TOKEN_RE = re.compile(r"[^,\s]+")
+_PLAIN_ETAG_RE = re.compile(r"[A-Za-z0-9_.:^=+\-]{1,96}")
+# Positive integers between commas; malformed, zero and negative tokens are skipped
+_WINDOW_TOKEN_RE = re.compile(r"(?:^|,)\s*\+?0*([1-9][0-9]*)\s*(?=,|$)")
 
 USE_ORJSON_ENV = (os.getenv("USE_ORJSON", "auto") or "auto").strip().lower()
 try:
@@ -36,7 +49,40 @@ except Exception:  # pragma: no cover - fallback when orjson missing
 
 USE_ORJSON = bool(orjson) and USE_ORJSON_ENV != "false"
 
+
+class OrjsonJSONProvider(DefaultJSONProvider):
+    """Route jsonify/request.get_json through orjson; unknown types fall back to Flask's default."""
+
+    def __init__(self, flask_app: Flask):
+        super().__init__(flask_app)
+        self.option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default, option=self.option).decode("utf-8")
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self.option)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+if USE_ORJSON:
+    app.json = OrjsonJSONProvider(app)
+
+# "strict" fsyncs every write, "off" never fsyncs; the default only fsyncs list files
+STOCKS_FSYNC = (os.getenv("STOCKS_FSYNC", "") or "").strip().lower()
+
+# Stored JSON is machine-read; PRETTY_JSON=1 restores indented output for debugging
+PRETTY_JSON = (os.getenv("PRETTY_JSON", "") or "").strip().lower() in {"1", "true", "yes"}
+
 ENABLE_HTTP_CACHE = (os.getenv("ENABLE_HTTP_CACHE", "true") or "true").strip().lower() not in {"0", "false", "no"}
+# Start the detail page's upstream loads while the browser is still fetching the page's scripts
+PREFETCH_DETAIL_DATA = (os.getenv("PREFETCH_DETAIL_DATA", "true") or "true").strip().lower() not in {"0", "false", "no"}
+DEFAULT_CACHE_CONTROL = "public, max-age=15, stale-while-revalidate=60"
+MARKET_DATA_CACHE_CONTROL = "private, max-age=30"
 
 
 def _resolve_int_env(name: str, default: int) -> int:
@@ -53,10 +99,35 @@ def _resolve_int_env(name: str, default: int) -> int:
 
 
 PRICE_TTL_SECONDS = max(1, _resolve_int_env("PRICE_TTL_SECONDS", 15))
+PRICE_BATCH_SIZE = max(1, _resolve_int_env("PRICE_BATCH_SIZE", 100))
+PRICE_FETCH_WORKERS = max(1, _resolve_int_env("PRICE_FETCH_WORKERS", 4))
+# How often the cache worker re-fetches every tracked symbol on its own; 0 disables it
+PRICE_WARM_INTERVAL_SECONDS = max(0, _resolve_int_env("PRICE_WARM_INTERVAL_SECONDS", 20))
+OVERVIEW_TTL_SECONDS = max(0, _resolve_int_env("OVERVIEW_TTL_SECONDS", 3600))
+# Only daily and weekly bars are served, so history only needs to track the latest bar
+HISTORY_TTL_SECONDS = max(0, _resolve_int_env("HISTORY_TTL_SECONDS", 300))
+NEWS_TTL_SECONDS = max(0, _resolve_int_env("NEWS_TTL_SECONDS", 300))
+# Chart loads and refreshes repeat the same indicator query back to back
+INDICATOR_TTL_SECONDS = max(0, _resolve_int_env("INDICATOR_TTL_SECONDS", 30))
+MARKET_DATA_ETAG_BUCKET_SECONDS = max(1, _resolve_int_env("MARKET_DATA_ETAG_BUCKET_SECONDS", 60))
+MMAP_READ_THRESHOLD_BYTES = 256 * 1024
+INDEX_FLUSH_DELAY_SECONDS = max(0, _resolve_int_env("INDEX_FLUSH_DELAY_MS", 200)) / 1000.0
 
 DATA_PATH = INDEX_FILE
 
-_state_lock = threading.RLock()
+# Every holder (upsert, delete, index flush) takes it once without re-entering; keep it a plain Lock
+_state_lock = threading.Lock()
+_index_dirty = threading.Event()
+_index_flusher: Optional[threading.Thread] = None
+
+RESPONSE_CACHE_MAX_ENTRIES = 128
+PRICES_INCREMENTAL_THRESHOLD = 256
+STREAM_CHUNK_RECORDS = 256
+# "columns" sends one array per field instead of one object per bar
+HISTORY_FORMATS = ("points", "columns")
+# Serialized API payloads keyed by (route, state_version, ...); cleared on every mutation
+_response_cache: Dict[Tuple[Any, ...], Any] = {}
+_response_cache_lock = threading.Lock()
 
 
 def _default_index() -> Dict[str, Any]:
@@ -69,35 +140,62 @@ def _default_index() -> Dict[str, Any]:
     }
 
 
-def _ensure_file() -> None:
-    """Ensure the index file exists so tooling can persist data."""
-    os.makedirs(DATA_ROOT, exist_ok=True)
-    if os.path.exists(INDEX_FILE):
-        return
-    with open(INDEX_FILE, "w", encoding="utf-8") as fh:
-        json.dump(_default_index(), fh, indent=2)
-
-
-def _json_loads(data: bytes) -> Any:
+def _json_loads(data: Any) -> Any:
     if not data:
         return []
     if USE_ORJSON and orjson is not None:
         return orjson.loads(data)
-    return json.loads(data.decode("utf-8"))
+    return json.loads(bytes(data).decode("utf-8"))
 
 
-def _json_dumps(data: Any) -> bytes:
+def _json_dumps(data: Any, pretty: bool = PRETTY_JSON) -> bytes:
     if USE_ORJSON and orjson is not None:
-        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
-    return json.dumps(data, indent=2).encode("utf-8")
+        if pretty:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        return orjson.dumps(data)
+    if pretty:
+        return json.dumps(data, indent=2).encode("utf-8")
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def _atomic_write_json(path: str, data: Any, pretty: bool = PRETTY_JSON, durable: bool = True) -> None:
+    payload = memoryview(_json_dumps(data, pretty=pretty))
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".stocks-", suffix=".tmp", dir=directory)
+    try:
+        try:
+            while payload:
+                written = os.write(fd, payload)
+                payload = payload[written:]
+            if durable or STOCKS_FSYNC == "strict":
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    finally:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+
+
+def _ensure_file() -> None:
+    """Ensure the index file exists so tooling can persist data."""
+    os.makedirs(DATA_ROOT, exist_ok=True)
+    if os.path.exists(INDEX_FILE):
+        return
+    _atomic_write_json(INDEX_FILE, _default_index(), durable=False)
 
 
 def _load_index() -> Dict[str, Any]:
     _ensure_file()
     try:
-        with open(INDEX_FILE, "r", encoding="utf-8") as fh:
-            data = json.load(fh)
-    except (OSError, json.JSONDecodeError):
+        with open(INDEX_FILE, "rb") as fh:
+            data = _json_loads(fh.read())
+    except (OSError, ValueError):
+        data = _default_index()
+    if not isinstance(data, dict):
         data = _default_index()
     merged = _default_index()
     merged.update({k: data.get(k, v) for k, v in merged.items()})
@@ -110,26 +208,87 @@ def _load_index() -> Dict[str, Any]:
         merged["weeks"] = {}
     if not isinstance(merged.get("state_version"), int):
         merged["state_version"] = 0
+    for meta in merged["by_id"].values():
+        _intern_index_fields(meta)
+    # Older index files kept a key for symbols whose last row was deleted
+    merged["by_symbol"] = {symbol: entries for symbol, entries in merged["by_symbol"].items() if entries}
+    for entries in merged["by_symbol"].values():
+        for entry in entries:
+            _intern_index_fields(entry)
     return merged
 
 
+_INTERNED_INDEX_FIELDS = ("week", "list", "symbol", "date_added", "date_spotted")
+
+
+def _intern_index_fields(entry: Any) -> None:
+    # Index entries repeat a handful of week, list and date strings thousands of times;
+    # interning lets by_id and by_symbol share one copy of each
+    if not isinstance(entry, dict):
+        return
+    for field in _INTERNED_INDEX_FIELDS:
+        value = entry.get(field)
+        if type(value) is str:
+            entry[field] = sys.intern(value)
+
+
 def _save_index(state: Dict[str, Any]) -> None:
     payload = dict(state)
-    _atomic_write_json(INDEX_FILE, payload)
+    # The index is rewritten on every mutation and can be rebuilt from the list
+    # files, so skip fsync unless STOCKS_FSYNC=strict
+    _atomic_write_json(INDEX_FILE, payload, durable=False)
+
+
+def _flush_index() -> None:
+    with _state_lock:
+        if not _index_dirty.is_set():
+            return
+        _index_dirty.clear()
+        try:
+            _save_index(_index_state)
+        except Exception as exc:  # pragma: no cover - disk failure path
+            _index_dirty.set()
+            app.logger.exception("Index flush failed: %s", exc)
+
+
+def _index_flush_loop() -> None:
+    while True:
+        _index_dirty.wait()
+        # Let a burst of mutations land before paying for one serialize + fsync
+        time.sleep(INDEX_FLUSH_DELAY_SECONDS)
+        _flush_index()
+
+
+def _mark_index_dirty() -> None:
+    global _index_flusher
+    _index_dirty.set()
+    if _index_flusher is None or not _index_flusher.is_alive():
+        _index_flusher = threading.Thread(target=_index_flush_loop, name="index-flusher", daemon=True)
+        _index_flusher.start()
+
+
+atexit.register(_flush_index)
 
 
 _index_state = _load_index()
 state_version = _index_state.get("state_version", 0)
+_weeks_sorted_cache: Optional[Tuple[Tuple[int, int], Tuple[str, ...], Tuple[str, ...]]] = None
+# week_end -> list_type -> records; write-through cache of the per-week list files
+_records: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+# (week_end, list_type) -> (records list, id -> record); rebuilt whenever the list is swapped
+_record_id_maps: Dict[Tuple[str, str], Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]] = {}
 
 
 def _bump_state_version() -> None:
     global state_version
     state_version = (state_version or 0) + 1
     _index_state["state_version"] = state_version
+    with _response_cache_lock:
+        _response_cache.clear()
 
 
 def _normalize_symbol_key(symbol: Optional[str]) -> str:
-    return (symbol or "").strip().upper()
+    return sys.intern((symbol or "").strip().upper())
 
 
 def _week_dir(week_end: str) -> str:
@@ -144,8 +303,10 @@ def _ensure_week_entry(week_end: str) -> None:
     week_end = week_end.strip()
     if not week_end:
         return
+    global _weeks_sorted_cache
     weeks = _index_state["weeks"]
     if week_end not in weeks:
+        _weeks_sorted_cache = None
         weeks[week_end] = {
             "label": _format_week_label(_parse_date(week_end)),
             "lists": {lt: {"count": 0} for lt in VALID_LIST_TYPES},
@@ -159,9 +320,17 @@ def _ensure_week_entry(week_end: str) -> None:
         _index_state["latest_week"] = week_end
 
 
-def _available_weeks(desc: bool = True) -> List[str]:
-    weeks = sorted(_index_state["weeks"].keys(), reverse=desc)
-    return weeks
+def _available_weeks(desc: bool = True) -> Tuple[str, ...]:
+    global _weeks_sorted_cache
+    weeks = _index_state["weeks"]
+    # Invalidated when a week is added; the key also guards against the dict being swapped
+    cache_key = (id(weeks), len(weeks))
+    cached = _weeks_sorted_cache
+    if cached is None or cached[0] != cache_key:
+        ascending = tuple(sorted(weeks))
+        cached = (cache_key, ascending, ascending[::-1])
+        _weeks_sorted_cache = cached
+    return cached[2] if desc else cached[1]
 
 
 def _latest_week() -> str:
@@ -172,28 +341,122 @@ def _latest_week() -> str:
     week = _calculate_week_info(today)["week_end"]
     _ensure_week_entry(week)
     _bump_state_version()
-    _save_index(_index_state)
+    _mark_index_dirty()
     return week
 
 
-def _load_list_records(week_end: str, list_type: str) -> List[Dict[str, Any]]:
-    path = _list_file_path(week_end, list_type)
-    if not os.path.exists(path):
-        return []
+def _read_list_file(week_end: str, list_type: str) -> List[Dict[str, Any]]:
+    # Missing lists are the common case on first touch; let open() report it instead of a separate stat
     try:
-        with open(path, "rb") as fh:
-            data = _json_loads(fh.read())
-    except (OSError, json.JSONDecodeError):
+        with open(_list_file_path(week_end, list_type), "rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            if size < MMAP_READ_THRESHOLD_BYTES:
+                data = _json_loads(fh.read())
+            else:
+                # Large lists are parsed straight from the page cache instead of a bytes copy
+                with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                    data = _json_loads(view)
+    except (OSError, ValueError):
+        return []
+    if not isinstance(data, list):
         return []
-    if isinstance(data, list):
-        return [record for record in data if isinstance(record, dict)]
-    return []
+    return _stamp_week_end(_iter_loaded_records(data), week_end)
+
+
+def _iter_loaded_records(data: List[Any]) -> Iterable[Dict[str, Any]]:
+    for record in data:
+        if not isinstance(record, dict):
+            continue
+        # Freshly parsed rows each carry their own symbol string; share the interned one
+        symbol = record.get("symbol")
+        if type(symbol) is str:
+            record["symbol"] = sys.intern(symbol)
+        yield record
+
+
+def _stamp_week_end(records: Iterable[Dict[str, Any]], week_end: str) -> List[Dict[str, Any]]:
+    # Stored records always carry the week of the file they live in, so readers can share them
+    return [
+        record if record.get("week_end") == week_end else {**record, "week_end": week_end}
+        for record in records
+    ]
+
+
+def _peek_list_records(week_end: str, list_type: str) -> List[Dict[str, Any]]:
+    """Like _load_list_records but returns the stored list itself; callers must not mutate it."""
+    records = _records.get(week_end, {}).get(list_type)
+    if records is None:
+        _load_list_records(week_end, list_type)
+        records = _records[week_end][list_type]
+    return records
+
+
+def _find_list_record(week_end: str, list_type: str, stock_id: Any) -> Optional[Dict[str, Any]]:
+    records = _peek_list_records(week_end, list_type)
+    key = (week_end, list_type)
+    cached = _record_id_maps.get(key)
+    # _save_list_records always stores a new list, so identity tells us the map is current
+    if cached is None or cached[0] is not records:
+        cached = (records, {str(record.get("id")): record for record in records})
+        _record_id_maps[key] = cached
+    return cached[1].get(str(stock_id))
+
+
+def _load_list_records(week_end: str, list_type: str) -> List[Dict[str, Any]]:
+    # Memory is authoritative; disk is only consulted the first time a list is touched
+    week_records = _records.setdefault(week_end, {})
+    records = week_records.get(list_type)
+    if records is None:
+        records = _read_list_file(week_end, list_type)
+        week_records[list_type] = records
+    return list(records)
 
 
 def _save_list_records(week_end: str, list_type: str, records: List[Dict[str, Any]]) -> None:
     os.makedirs(_week_dir(week_end), exist_ok=True)
     path = _list_file_path(week_end, list_type)
-    _atomic_write_json(path, records)
+    records = _stamp_week_end(records, week_end)
+    _atomic_write_json(path, records, durable=STOCKS_FSYNC != "off")
+    _records.setdefault(week_end, {})[list_type] = records
+
+
+def _symbol_entry_key(entry: Dict[str, Any]) -> Tuple[str, str]:
+    # Ascending by spotted date, so the latest sighting of a symbol is always entries[-1]
+    week = entry.get("week") or ""
+    return (entry.get("date_spotted") or entry.get("date_added") or week, week)
+
+
+def _bisect_symbol_entries(entries: List[Dict[str, Any]], key: Tuple[str, str], right: bool = False) -> int:
+    lo, hi = 0, len(entries)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        mid_key = _symbol_entry_key(entries[mid])
+        if mid_key < key or (right and mid_key == key):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _discard_symbol_entry(stock_id: str, meta: Dict[str, Any]) -> None:
+    symbol = _normalize_symbol_key(meta.get("symbol"))
+    entries = _index_state["by_symbol"].get(symbol)
+    if not entries:
+        return
+    # by_symbol lists stay sorted, so the entry sits in the run of equal keys
+    idx = _bisect_symbol_entries(entries, _symbol_entry_key(meta))
+    while idx < len(entries) and _symbol_entry_key(entries[idx]) == _symbol_entry_key(meta):
+        if entries[idx].get("id") == stock_id:
+            break
+        idx += 1
+    else:
+        idx = next((i for i, entry in enumerate(entries) if entry.get("id") == stock_id), None)
+        if idx is None:
+            return
+    del entries[idx]
+    # A symbol with no rows left is no longer tracked, so price warm-up and prefetch skip it
+    if not entries:
+        _index_state["by_symbol"].pop(symbol, None)
 
 
 def _index_record(record: Dict[str, Any], week_end: str, list_type: str) -> None:
@@ -208,13 +471,15 @@ def _index_record(record: Dict[str, Any], week_end: str, list_type: str) -> None
         "date_added": record.get("date_added"),
         "date_spotted": record.get("date_spotted"),
     }
+    _intern_index_fields(meta)
+    previous = _index_state["by_id"].get(stock_id)
+    if previous:
+        _discard_symbol_entry(stock_id, previous)
     _index_state["by_id"][stock_id] = meta
     if symbol:
         entries = _index_state["by_symbol"].setdefault(symbol, [])
-        filtered = [entry for entry in entries if entry.get("id") != stock_id]
-        filtered.append({"id": stock_id, **meta})
-        filtered.sort(key=lambda item: (item.get("week"), item.get("date_added") or item.get("week")))
-        _index_state["by_symbol"][symbol] = filtered
+        entry = {"id": stock_id, **meta}
+        entries.insert(_bisect_symbol_entries(entries, _symbol_entry_key(entry), right=True), entry)
 
 
 def _remove_index_entry(stock_id: str) -> None:
@@ -224,11 +489,7 @@ def _remove_index_entry(stock_id: str) -> None:
     entry = _index_state["by_id"].pop(stock_id, None)
     if not entry:
         return
-    symbol = entry.get("symbol")
-    if symbol:
-        normalized = _normalize_symbol_key(symbol)
-        entries = _index_state["by_symbol"].get(normalized, [])
-        _index_state["by_symbol"][normalized] = [item for item in entries if item.get("id") != stock_id]
+    _discard_symbol_entry(stock_id, entry)
 
 
 def _update_week_counts(week_end: str, list_type: str, count: int) -> None:
@@ -239,22 +500,33 @@ def _update_week_counts(week_end: str, list_type: str, count: int) -> None:
     week_info["lists"][list_type]["count"] = count
 
 
+def _stored_week_dirs() -> List[str]:
+    """Week folders under DATA_ROOT, oldest first; folders not named by ISO date are skipped."""
+    try:
+        entries = sorted(os.listdir(DATA_ROOT))
+    except OSError:
+        return []
+    return [
+        entry
+        for entry in entries
+        if _parse_iso_date(entry) is not None and os.path.isdir(os.path.join(DATA_ROOT, entry))
+    ]
+
+
 def _rebuild_index_from_files() -> bool:
+    global _weeks_sorted_cache
     found = False
     if not os.path.isdir(DATA_ROOT):
         return False
-    entries = sorted(os.listdir(DATA_ROOT))
+    entries = _stored_week_dirs()
+    _records.clear()
+    _weeks_sorted_cache = None
     _index_state["by_id"] = {}
     _index_state["by_symbol"] = {}
     _index_state["weeks"] = {}
+    # Recomputed from the scanned folders by _ensure_week_entry
+    _index_state["latest_week"] = None
     for entry in entries:
-        week_path = os.path.join(DATA_ROOT, entry)
-        if not os.path.isdir(week_path):
-            continue
-        try:
-            _parse_date(entry)
-        except Exception:
-            continue
         _ensure_week_entry(entry)
         for lt in VALID_LIST_TYPES:
             records = _load_list_records(entry, lt)
@@ -269,18 +541,54 @@ def _rebuild_index_from_files() -> bool:
     return found
 
 
+def _index_matches_list_files() -> bool:
+    """Whether index.json describes exactly the rows in the list files on disk."""
+    # List files are written immediately but the index is flushed a moment later, so a
+    # crash in between leaves the files ahead of the index
+    weeks = _index_state["weeks"]
+    by_id = _index_state["by_id"]
+    indexed = 0
+    for week in sorted(set(_stored_week_dirs()) | set(weeks)):
+        list_meta = (weeks.get(week) or {}).get("lists") or {}
+        for lt in VALID_LIST_TYPES:
+            records = _load_list_records(week, lt)
+            if (list_meta.get(lt) or {}).get("count", 0) != len(records):
+                return False
+            for record in records:
+                stock_id = str(record.get("id") or "").strip()
+                if not stock_id:
+                    continue
+                meta = by_id.get(stock_id)
+                if (
+                    meta is None
+                    or meta.get("week") != week
+                    or meta.get("list") != lt
+                    or meta.get("symbol") != _normalize_symbol_key(record.get("symbol"))
+                    or meta.get("date_added") != record.get("date_added")
+                    or meta.get("date_spotted") != record.get("date_spotted")
+                ):
+                    return False
+                indexed += 1
+    return indexed == len(by_id)
+
+
 def _load_grouped_lists(weeks: List[str]) -> Dict[str, List[Dict[str, Any]]]:
-    grouped = {lt: [] for lt in VALID_LIST_TYPES}
+    list_types = VALID_LIST_TYPES
+    peek = _peek_list_records
+    known_weeks = _index_state["weeks"]
+    grouped: Dict[str, List[Dict[str, Any]]] = {lt: [] for lt in list_types}
     for week in weeks:
         normalized_week = week.strip()
         if not normalized_week:
             continue
-        for lt in VALID_LIST_TYPES:
-            records = _load_list_records(normalized_week, lt)
-            for record in records:
-                entry = dict(record)
-                entry["week_end"] = normalized_week
-                grouped[lt].append(entry)
+        list_meta = (known_weeks.get(normalized_week) or {}).get("lists") or {}
+        in_memory = _records.get(normalized_week) or {}
+        for lt in list_types:
+            # The index tracks per-list counts; don't touch lists it knows are empty, unless
+            # memory already holds rows the index hasn't caught up with
+            if (list_meta.get(lt) or {}).get("count") == 0 and not in_memory.get(lt):
+                continue
+            grouped[lt].extend(peek(normalized_week, lt))
     return grouped
 
 
@@ -336,27 +644,18 @@ def _expand_week_range(start: str, end: str) -> List[str]:
     end_week = _normalize_week_value(end)
     if not start_week or not end_week:
         return []
-    start_date = _parse_date(start_week)
-    end_date = _parse_date(end_week)
-    if start_date > end_date:
-        start_date, end_date = end_date, start_date
-    weeks: List[str] = []
-    current = start_date
-    while current <= end_date:
-        info = _calculate_week_info(current)
-        week_end = info["week_end"]
-        if week_end not in weeks:
-            weeks.append(week_end)
-        current += timedelta(days=7)
-    if end_week not in weeks:
-        weeks.append(end_week)
-    return weeks
+    # Both bounds are already week-end Sundays, so every week in between is 7 days apart
+    start_ord = _parse_date(start_week).toordinal()
+    end_ord = _parse_date(end_week).toordinal()
+    if start_ord > end_ord:
+        start_ord, end_ord = end_ord, start_ord
+    return [date.fromordinal(ordinal).isoformat() for ordinal in range(start_ord, end_ord + 1, 7)]
 
 
 def _resolve_weeks_from_request() -> List[str]:
     raw = (request.args.get("week") or "").strip()
     parsed = _parse_weeks_param(raw)
-    available = set(_available_weeks(desc=False))
+    available = _index_state["weeks"]
     filtered = [week for week in parsed if week in available]
     if filtered:
         return filtered
@@ -365,12 +664,11 @@ def _resolve_weeks_from_request() -> List[str]:
 
 
 def _remove_record_from_file(week_end: str, list_type: str, stock_id: str) -> bool:
-    records = _load_list_records(week_end, list_type)
-    if not records:
-        return False
-    updated = [record for record in records if str(record.get("id")) != str(stock_id)]
-    if len(updated) == len(records):
+    target = _find_list_record(week_end, list_type, stock_id)
+    if target is None:
         return False
+    # The id map already located the row, so the rewrite only compares identities
+    updated = [record for record in _peek_list_records(week_end, list_type) if record is not target]
     _save_list_records(week_end, list_type, updated)
     _update_week_counts(week_end, list_type, len(updated))
     return True
@@ -380,17 +678,26 @@ def _upsert_record(record: Dict[str, Any], previous: Optional[Dict[str, str]] =
     normalized = _normalize_loaded_row(record)
     if not normalized:
         raise ValueError("invalid stock payload")
-    stock_id = normalized.get("id")
+    stock_id = str(normalized.get("id") or "").strip()
     if not stock_id:
         raise ValueError("stock id is required")
+    # Read paths trust the stored id/symbol form and skip re-normalizing per request
+    normalized["id"] = stock_id
     target_week = normalized.get("week_end")
     if not target_week:
         target_week = _calculate_week_info(normalized.get("date_spotted") or normalized.get("date_added"))["week_end"]
         normalized["week_end"] = target_week
     target_list = _normalize_list_type(normalized.get("list_type"))
     normalized["list_type"] = target_list
+    moved = bool(previous) and (
+        previous.get("week") != target_week or _normalize_list_type(previous.get("list")) != target_list
+    )
     with _state_lock:
         _ensure_week_entry(target_week)
+        # An edit that changes nothing would still rewrite the list file and invalidate
+        # every cached response; skip it
+        if not moved and _find_list_record(target_week, target_list, stock_id) == normalized:
+            return normalized
         records = _load_list_records(target_week, target_list)
         replaced = False
         for idx, existing in enumerate(records):
@@ -402,13 +709,11 @@ def _upsert_record(record: Dict[str, Any], previous: Optional[Dict[str, str]] =
             records.append(normalized)
         _save_list_records(target_week, target_list, records)
         _update_week_counts(target_week, target_list, len(records))
-        if previous and (
-            previous.get("week") != target_week or _normalize_list_type(previous.get("list")) != target_list
-        ):
+        if moved:
             _remove_record_from_file(previous["week"], _normalize_list_type(previous["list"]), stock_id)
         _index_record(normalized, target_week, target_list)
         _bump_state_version()
-        _save_index(_index_state)
+        _mark_index_dirty()
     return normalized
 
 
@@ -429,10 +734,11 @@ def _delete_record(stock_id: str) -> bool:
             return False
         _remove_index_entry(stock_id)
         _bump_state_version()
-        _save_index(_index_state)
+        _mark_index_dirty()
         return True
 
 
+@lru_cache(maxsize=64)
 def _normalize_list_type(list_type: Optional[str]) -> str:
     lt = (list_type or "").strip().upper()
     if lt not in VALID_LIST_TYPES_SET:
@@ -445,28 +751,126 @@ def _stock_api_module():
     return importlib.import_module("stock_api")
 
 
-def fetch_price_history(*args, **kwargs):
-    return _stock_api_module().fetch_price_history(*args, **kwargs)
+class SingleFlightCache:
+    """TTL cache-aside where concurrent misses on one key share a single upstream call."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[Any, ...], Tuple[Any, float]] = {}
+        self._inflight: Dict[Tuple[Any, ...], threading.Event] = {}
+
+    def get_or_load(self, key: Tuple[Any, ...], ttl: float, loader, should_cache=bool) -> Any:
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry and time.time() - entry[1] <= ttl:
+                    return entry[0]
+                event = self._inflight.get(key)
+                leader = event is None
+                if leader:
+                    event = threading.Event()
+                    self._inflight[key] = event
+            if not leader:
+                # Re-check once the leader finishes; if it failed, one waiter takes over
+                event.wait()
+                continue
+            try:
+                value = loader()
+                if should_cache(value):
+                    with self._lock:
+                        self._entries.pop(key, None)
+                        while len(self._entries) >= self.max_entries:
+                            self._entries.pop(next(iter(self._entries)))
+                        self._entries[key] = (value, time.time())
+                return value
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+                event.set()
+
+    def loaded_at(self, key: Tuple[Any, ...], ttl: float) -> Optional[float]:
+        """When the entry under ``key`` was fetched, or None if the next get_or_load would load it."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and time.time() - entry[1] <= ttl:
+            return entry[1]
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
 
+upstream_cache = SingleFlightCache()
 
-def compute_sma(*args, **kwargs):
-    return _stock_api_module().compute_sma(*args, **kwargs)
 
+def _has_overview_fields(data: Any) -> bool:
+    # A bare {"symbol": ...} means every upstream lookup failed; don't pin that for an hour
+    return isinstance(data, dict) and len(data) > 1
 
-def compute_ema(*args, **kwargs):
-    return _stock_api_module().compute_ema(*args, **kwargs)
 
+def _history_cache_key(symbol: str, interval: Optional[str], columnar: bool) -> Tuple[Any, ...]:
+    # Keyed by UTC day as well, so a new trading day never serves yesterday's bars
+    day = datetime.utcnow().date().isoformat()
+    return ("history", _normalize_symbol_key(symbol), (interval or "").strip().lower(), day, columnar)
 
-def compute_rsi(*args, **kwargs):
-    return _stock_api_module().compute_rsi(*args, **kwargs)
 
+def fetch_price_history(symbol: str, interval: Optional[str] = None, columnar: bool = False):
+    return upstream_cache.get_or_load(
+        _history_cache_key(symbol, interval, columnar),
+        HISTORY_TTL_SECONDS,
+        lambda: _stock_api_module().fetch_price_history(symbol, interval, columnar=columnar),
+        should_cache=_has_history_points,
+    )
 
-def fetch_news(*args, **kwargs):
-    return _stock_api_module().fetch_news(*args, **kwargs)
 
+def _indicator_cache_key(kind: str, symbol: str, interval: str, param: Any) -> Tuple[Any, ...]:
+    return ("indicator", kind, _normalize_symbol_key(symbol), (interval or "").strip().lower(), param)
 
-def fetch_overview(*args, **kwargs):
-    return _stock_api_module().fetch_overview(*args, **kwargs)
+
+def _cached_indicator(kind: str, symbol: str, interval: str, param: Any, compute):
+    key = _indicator_cache_key(kind, symbol, interval, param)
+    return upstream_cache.get_or_load(key, INDICATOR_TTL_SECONDS, compute, should_cache=_has_indicator_values)
+
+
+def compute_sma(symbol: str, interval: str, windows: Iterable[int]):
+    windows = tuple(windows)
+    return _cached_indicator(
+        "sma", symbol, interval, windows, lambda: _stock_api_module().compute_sma(symbol, interval, windows)
+    )
+
+
+def compute_ema(symbol: str, interval: str, windows: Iterable[int]):
+    windows = tuple(windows)
+    return _cached_indicator(
+        "ema", symbol, interval, windows, lambda: _stock_api_module().compute_ema(symbol, interval, windows)
+    )
+
+
+def compute_rsi(symbol: str, interval: str, period: int):
+    return _cached_indicator(
+        "rsi", symbol, interval, period, lambda: _stock_api_module().compute_rsi(symbol, interval, period)
+    )
+
+
+def fetch_news(symbol: str, limit: int = 10):
+    key = ("news", _normalize_symbol_key(symbol), limit)
+    return upstream_cache.get_or_load(
+        key,
+        NEWS_TTL_SECONDS,
+        lambda: _stock_api_module().fetch_news(symbol, limit=limit),
+    )
+
+
+def fetch_overview(symbol: str):
+    key = ("overview", _normalize_symbol_key(symbol))
+    return upstream_cache.get_or_load(
+        key,
+        OVERVIEW_TTL_SECONDS,
+        lambda: _stock_api_module().fetch_overview(symbol),
+        should_cache=_has_overview_fields,
+    )
 
 
 def get_current_prices(*args, **kwargs):
@@ -477,63 +881,110 @@ def calculate_percent_change(*args, **kwargs):
     return _stock_api_module().calculate_percent_change(*args, **kwargs)
 
 
+def calculate_percent_changes(*args, **kwargs):
+    return _stock_api_module().calculate_percent_changes(*args, **kwargs)
+
+
 class PriceCache:
-    def __init__(self, ttl_seconds: int = 15):
+    def __init__(self, ttl_seconds: int = 15, warm_symbols=None, warm_interval: float = 0):
         self.ttl = max(1, ttl_seconds)
+        # Optional callable returning the symbols to keep hot between requests
+        self._warm_symbols = warm_symbols
+        self._warm_interval = warm_interval if warm_symbols is not None and warm_interval > 0 else None
+        # _lock guards _pending and epoch; _wakeup tells the worker there is pending work
         self._lock = threading.Lock()
-        self._cond = threading.Condition(self._lock)
+        self._wakeup = threading.Event()
         self._cache: Dict[str, Tuple[Optional[float], float]] = {}
         self._pending: set[str] = set()
         self._shutdown = False
         self._worker: Optional[threading.Thread] = None
+        # Shared by every refresh so large batches don't spin up a fresh pool each cycle
+        self._fetch_pool: Optional[ThreadPoolExecutor] = None
+        # Bumped whenever cached prices change so derived responses can be keyed on it
+        self.epoch = 0
 
     def stop(self) -> None:
-        with self._cond:
-            self._shutdown = True
-            self._cond.notify_all()
+        self._shutdown = True
+        self._wakeup.set()
         worker = self._worker
         if worker:
             worker.join(timeout=1)
-
-    def get_many(self, symbols: Iterable[str], *, schedule_refresh: bool = True) -> Dict[str, Optional[float]]:
+        pool = self._fetch_pool
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    def get_many(
+        self,
+        symbols: Iterable[str],
+        *,
+        schedule_refresh: bool = True,
+        normalized: bool = False,
+    ) -> Dict[str, Optional[float]]:
+        """Return cached prices; pass normalized=True when symbols are already stripped/uppercased."""
         now = time.time()
+        ttl = self.ttl
+        # Entries are immutable (price, fetched_at) tuples swapped in whole, so reads
+        # need no lock; it is only taken when a refresh has to be scheduled
+        cache = self._cache
         results: Dict[str, Optional[float]] = {}
-        unique_symbols = []
-        seen = set()
+        # Ordered set of symbols to refresh, allocated only once something misses
+        stale: Optional[Dict[str, None]] = None
         for sym in symbols:
-            normalized = (sym or "").strip().upper()
-            if not normalized or normalized in seen:
+            if not normalized:
+                sym = sys.intern((sym or "").strip().upper())
+            if not sym or sym in results or (stale is not None and sym in stale):
                 continue
-            seen.add(normalized)
-            unique_symbols.append(normalized)
-
-        to_refresh: set[str] = set()
-        with self._cond:
-            start_worker = False
-            for sym in unique_symbols:
-                cached = self._cache.get(sym)
-                if cached and now - cached[1] <= self.ttl:
-                    results[sym] = cached[0]
-                else:
-                    if cached:
-                        results[sym] = cached[0]
-                    if schedule_refresh and sym not in self._pending:
-                        self._pending.add(sym)
-                        to_refresh.add(sym)
-                        start_worker = True
-            if start_worker and not self._shutdown:
-                self._ensure_worker_locked()
-            if to_refresh and not self._shutdown:
-                self._cond.notify()
+            cached = cache.get(sym)
+            if cached is not None:
+                results[sym] = cached[0]
+                if now - cached[1] <= ttl:
+                    continue
+            if stale is None:
+                stale = {}
+            stale[sym] = None
+
+        if stale and schedule_refresh:
+            self._schedule(list(stale))
         return results
 
+    def get_many_ordered(self, symbols: List[str], *, schedule_refresh: bool = True) -> List[Optional[float]]:
+        """Return prices aligned with ``symbols``, which must already be normalized."""
+        now = time.time()
+        cache = self._cache
+        ttl = self.ttl
+        values: List[Optional[float]] = []
+        stale: List[str] = []
+        for sym in symbols:
+            cached = cache.get(sym)
+            if cached is None:
+                values.append(None)
+                stale.append(sym)
+                continue
+            values.append(cached[0])
+            if now - cached[1] > ttl:
+                stale.append(sym)
+        if stale and schedule_refresh:
+            self._schedule(stale)
+        return values
+
+    def _schedule(self, symbols: List[str]) -> None:
+        with self._lock:
+            pending = self._pending
+            to_refresh = [sym for sym in symbols if sym not in pending]
+            if not to_refresh or self._shutdown:
+                return
+            pending.update(to_refresh)
+            self._ensure_worker_locked()
+        self._wakeup.set()
+
     def prime(self, symbol: str, price: Optional[float]) -> None:
         normalized = (symbol or "").strip().upper()
         if not normalized:
             return
-        with self._cond:
+        with self._lock:
             self._cache[normalized] = (price, time.time())
             self._pending.discard(normalized)
+            self.epoch += 1
 
     def _ensure_worker_locked(self) -> None:
         if self._worker and self._worker.is_alive():
@@ -544,81 +995,149 @@ class PriceCache:
 
     def _worker_loop(self) -> None:
         retry_delay = 1.0
+        warm_interval = self._warm_interval
+        last_warm = time.monotonic()
         while True:
-            with self._cond:
-                while not self._pending and not self._shutdown:
-                    self._cond.wait()
-                if self._shutdown:
-                    return
+            timeout = None
+            if warm_interval is not None:
+                timeout = max(0.0, last_warm + warm_interval - time.monotonic())
+            self._wakeup.wait(timeout)
+            if self._shutdown:
+                return
+            # Checked on every wakeup: steady request traffic keeps setting _wakeup, and the
+            # warm pass must still run once it is due
+            if warm_interval is not None and time.monotonic() - last_warm >= warm_interval:
+                last_warm = time.monotonic()
+                self._queue_warm_symbols()
+            with self._lock:
                 batch = list(self._pending)
                 self._pending.clear()
+                # Cleared under the lock, so anything scheduled after this sets it again
+                self._wakeup.clear()
             if not batch:
                 continue
             start = time.time()
-            try:
-                prices = get_current_prices(batch) or {}
-            except Exception as exc:  # pragma: no cover - network failure path
-                app.logger.exception("Price batch fetch failed for %d symbols: %s", len(batch), exc)
+            prices, failed = self._fetch_batch(batch)
+            fetched_at = time.time()
+            failed_set = set(failed)
+            refreshed = [sym for sym in batch if sym not in failed_set]
+            if refreshed:
+                with self._lock:
+                    for sym in refreshed:
+                        self._cache[sym] = (prices.get(sym), fetched_at)
+                    self.epoch += 1
+            if failed:
                 time.sleep(min(retry_delay, 30.0))
                 retry_delay = min(retry_delay * 2, 30.0)
-                with self._cond:
-                    self._pending.update(batch)
+                with self._lock:
+                    self._pending.update(failed)
+                self._wakeup.set()
                 continue
 
             retry_delay = 1.0
-            fetched_at = time.time()
-            with self._cond:
-                for sym in batch:
-                    price = prices.get(sym)
-                    self._cache[sym] = (price, fetched_at)
             duration_ms = (time.time() - start) * 1000.0
             app.logger.info("Price cache refreshed %d symbols in %.1fms", len(batch), duration_ms)
 
+    def _queue_warm_symbols(self) -> None:
+        try:
+            symbols = list(self._warm_symbols())
+        except Exception as exc:  # pragma: no cover - defensive, provider reads shared state
+            app.logger.warning("Price warm-up skipped: %s", exc)
+            return
+        now = time.time()
+        cache = self._cache
+        stale = []
+        for sym in symbols:
+            cached = cache.get(sym)
+            if cached is None or now - cached[1] > self.ttl:
+                stale.append(sym)
+        if stale:
+            with self._lock:
+                self._pending.update(stale)
+
+    def _fetch_batch(self, batch: List[str]) -> Tuple[Dict[str, Optional[float]], List[str]]:
+        """Fetch prices in PRICE_BATCH_SIZE chunks, fanning out when there is more than one."""
+        chunks = [batch[i:i + PRICE_BATCH_SIZE] for i in range(0, len(batch), PRICE_BATCH_SIZE)]
+        prices: Dict[str, Optional[float]] = {}
+        failed: List[str] = []
+        if len(chunks) == 1:
+            try:
+                prices.update(get_current_prices(chunks[0]) or {})
+            except Exception as exc:  # pragma: no cover - network failure path
+                app.logger.exception("Price batch fetch failed for %d symbols: %s", len(batch), exc)
+                failed.extend(batch)
+            return prices, failed
+        pool = self._fetch_pool
+        if pool is None:
+            # Only the worker thread fetches, so lazy creation needs no lock
+            pool = self._fetch_pool = ThreadPoolExecutor(
+                max_workers=PRICE_FETCH_WORKERS, thread_name_prefix="price-fetch"
+            )
+        futures = [(pool.submit(get_current_prices, chunk), chunk) for chunk in chunks]
+        for future, chunk in futures:
+            try:
+                prices.update(future.result() or {})
+            except Exception as exc:  # pragma: no cover - network failure path
+                app.logger.exception("Price batch fetch failed for %d symbols: %s", len(chunk), exc)
+                failed.extend(chunk)
+        return prices, failed
+
+
+@lru_cache(maxsize=8192)
 def _normalize_symbol(symbol: str) -> str:
     sym = (symbol or "").strip().upper()
     if not sym:
         raise ValueError("symbol is required")
-    return sym
+    # Interned so stored rows, index keys and price cache keys share one object per ticker
+    return sys.intern(sym)
+
+
+@lru_cache(maxsize=256)
+def _parse_windows_tuple(raw: str) -> Tuple[int, ...]:
+    return tuple(int(match) for match in _WINDOW_TOKEN_RE.findall(raw))
 
 
 def _parse_windows_param(raw: Optional[str]) -> List[int]:
     if not raw:
         return []
-    windows: List[int] = []
-    for part in raw.split(","):
-        part = part.strip()
-        if not part:
-            continue
-        try:
-            value = int(part)
-        except ValueError:
-            continue
-        if value > 0:
-            windows.append(value)
-    return windows
+    # Clients send the same few window lists over and over, so parse each string once
+    return list(_parse_windows_tuple(raw))
 
 
-def _json_error(message: str, status: int = 400):
-    return jsonify({"error": message}), status
+def _json_response(data: Any, status: int = 200):
+    response = app.json.response(data)
+    response.status_code = status
+    return response
 
 
+def _stream_json_records(data: Dict[str, Any], list_key: str, chunk_size: int = STREAM_CHUNK_RECORDS):
+    """Yield ``data`` as JSON with ``data[list_key]`` encoded ``chunk_size`` records at a time."""
+    head = {key: value for key, value in data.items() if key != list_key}
+    prefix = _json_dumps(head, pretty=False)[:-1]
+    yield prefix + (b"," if head else b"") + _json_dumps(list_key, pretty=False) + b":["
+    records = data.get(list_key) or []
+    for start in range(0, len(records), chunk_size):
+        chunk = _json_dumps(records[start : start + chunk_size], pretty=False)[1:-1]
+        yield (b"," + chunk) if start else chunk
+    yield b"]}"
 
-def _atomic_write_json(path: str, data: Any) -> None:
-    directory = os.path.dirname(path) or "."
-    os.makedirs(directory, exist_ok=True)
-    fd, tmp_path = tempfile.mkstemp(prefix=".stocks-", suffix=".tmp", dir=directory)
-    try:
-        with os.fdopen(fd, "wb") as tmp_file:
-            payload = _json_dumps(data)
-            tmp_file.write(payload)
-            tmp_file.flush()
-            os.fsync(tmp_file.fileno())
-        os.replace(tmp_path, path)
-    finally:
-        try:
-            os.remove(tmp_path)
-        except FileNotFoundError:
-            pass
+
+def _json_records_response(data: Dict[str, Any], list_key: str):
+    records = data.get(list_key)
+    if not isinstance(records, list) or len(records) <= STREAM_CHUNK_RECORDS:
+        return _json_response(data)
+    # Long series go out chunk by chunk instead of as one fully encoded body
+    return app.response_class(_stream_json_records(data, list_key), mimetype="application/json")
+
+
+@lru_cache(maxsize=64)
+def _error_body(message: str) -> bytes:
+    # Validation messages come from a small fixed set, so their bodies are encoded once
+    return _json_dumps({"error": message})
+
+
+def _json_error(message: str, status: int = 400):
+    return app.response_class(_error_body(message), status=status, mimetype="application/json")
 
 
 def _normalize_loaded_row(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -635,7 +1154,8 @@ def _normalize_loaded_row(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     return normalized
 
 
-def _get_stock_by_id(stock_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+def _get_stock_by_id(stock_id: str) -> Optional[Tuple[str, Mapping[str, Any]]]:
+    """Return (symbol, stored record); the record is shared, so copy it before mutating."""
     stock_id = str(stock_id or "").strip()
     if not stock_id:
         return None
@@ -646,46 +1166,176 @@ def _get_stock_by_id(stock_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
     list_type = _normalize_list_type(entry.get("list"))
     if not week:
         return None
-    records = _load_list_records(week, list_type)
-    for record in records:
-        if str(record.get("id")) == stock_id:
-            return record.get("symbol"), dict(record)
-    return None
+    record = _find_list_record(week, list_type, stock_id)
+    if record is None:
+        return None
+    return record.get("symbol"), record
+
+
+def _cached_value(key: Tuple[Any, ...], build) -> Any:
+    with _response_cache_lock:
+        payload = _response_cache.get(key)
+    if payload is None:
+        payload = build()
+        with _response_cache_lock:
+            if len(_response_cache) >= RESPONSE_CACHE_MAX_ENTRIES:
+                _response_cache.clear()
+            _response_cache[key] = payload
+    return payload
+
+
+def _cached_json_response(key: Tuple[Any, ...], build) -> Any:
+    return _cached_payload_response(key, lambda: _json_dumps(build(), pretty=False))
+
+
+def _cached_payload_response(key: Tuple[Any, ...], serialize) -> Any:
+    def _serialize() -> Tuple[bytes, str]:
+        payload = serialize()
+        # Hash the bytes once here; hits reuse the stored ETag
+        return payload, _make_etag_token(payload)
+
+    payload, token = _cached_value(key, _serialize)
+    not_modified = _not_modified_response(token, DEFAULT_CACHE_CONTROL)
+    if not_modified is not None:
+        return not_modified
+    response = app.response_class(payload, mimetype="application/json")
+    return _set_cache_headers(response, token)
+
+
+def _build_latest_by_symbol() -> Dict[str, Dict[str, Any]]:
+    latest: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+    # Same ordering as _parse_date (unparseable dates count as today), but today is
+    # resolved once and rows compare as day ordinals
+    today = datetime.utcnow().date().toordinal()
+    for row in _read_stocks():
+        if not isinstance(row, dict):
+            continue
+        symbol = _normalize_symbol_key(row.get("symbol"))
+        if not symbol:
+            continue
+        raw = row.get("week_end") or row.get("date_added") or row.get("date_spotted")
+        parsed = _parse_iso_date(raw) if isinstance(raw, str) and raw else None
+        key = parsed.toordinal() if parsed is not None else today
+        current = latest.get(symbol)
+        if current is None or key > current[0]:
+            latest[symbol] = (key, row)
+    return {symbol: row for symbol, (_, row) in latest.items()}
+
+
+def _build_symbol_scan_buffer(weeks: List[str], list_filter: Optional[str] = None) -> bytes:
+    # One "<symbol>\t<id>\t<list_type>" line per record so search can run a single regex pass;
+    # filtered searches get their own buffer holding only that list
+    lines = []
+    for row in _read_stocks(weeks=weeks):
+        symbol = row.get("symbol")
+        if not symbol:
+            continue
+        if list_filter is not None and row.get("list_type") != list_filter:
+            continue
+        lines.append(f"{symbol}\t{row.get('id') or ''}\t{row.get('list_type') or ''}")
+    return "\n".join(lines).encode("utf-8")
 
 
 def _make_etag_token(*parts: Any) -> str:
-    raw = ":".join(str(part) for part in parts)
-    digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()
-    return digest
+    if len(parts) == 1 and isinstance(parts[0], bytes):
+        return hashlib.blake2b(parts[0], digest_size=16).hexdigest()
+    if not any(isinstance(part, (list, tuple)) for part in parts):
+        # Version/epoch tags are already unique; use them verbatim when they are short and header-safe
+        plain = ":".join(str(part) for part in parts)
+        if _PLAIN_ETAG_RE.fullmatch(plain):
+            return plain
+    # Hashed incrementally; list/tuple parts are fed as comma-separated tokens so
+    # callers never build the joined string just to hash it
+    digest = hashlib.blake2b(digest_size=16)
+    for index, part in enumerate(parts):
+        if index:
+            digest.update(b":")
+        if isinstance(part, (list, tuple)):
+            for position, token in enumerate(part):
+                if position:
+                    digest.update(b",")
+                digest.update(str(token).encode("utf-8"))
+        else:
+            digest.update(str(part).encode("utf-8"))
+    return digest.hexdigest()
 
 
-def _maybe_set_cache_headers(response, *etag_parts: Any):
+def _set_cache_headers(response, token: str, cache_control: str = DEFAULT_CACHE_CONTROL):
     if not ENABLE_HTTP_CACHE:
         return response
-    token = _make_etag_token(*etag_parts)
     response.set_etag(token, weak=True)
-    response.headers["Cache-Control"] = "public, max-age=15, stale-while-revalidate=60"
+    response.headers["Cache-Control"] = cache_control
     return response
 
 
-def _parse_date(date_str: Optional[str]) -> date:
-    if not date_str:
-        return datetime.utcnow().date()
+def _market_data_etag(key: Tuple[Any, ...], ttl: float, *parts: Any) -> Optional[str]:
+    # Upstream bars carry no version, so tie the tag to when the cached payload under ``key``
+    # was fetched plus a coarse time bucket; with nothing cached there is nothing to revalidate
+    loaded_at = upstream_cache.loaded_at(key, ttl)
+    if loaded_at is None:
+        return None
+    bucket = int(time.time() // MARKET_DATA_ETAG_BUCKET_SECONDS)
+    return _make_etag_token(*parts, loaded_at, bucket)
+
+
+def _has_history_points(data: Any) -> bool:
+    if not isinstance(data, dict):
+        return False
+    columns = data.get("columns")
+    return bool(data.get("points") or (isinstance(columns, dict) and columns.get("date")))
+
+
+def _has_indicator_values(data: Any) -> bool:
+    return isinstance(data, dict) and bool(data.get("indicators") or data.get("values"))
+
+
+def _set_market_data_headers(response, data: Any, token: Optional[str], has_data):
+    # Only tag payloads worth keeping: an empty or failed upstream result must not be
+    # revalidated with 304s until the ETag bucket rolls over
+    if token is None or not has_data(data):
+        return response
+    return _set_cache_headers(response, token, MARKET_DATA_CACHE_CONTROL)
+
+
+def _not_modified_response(token: Optional[str], cache_control: str = MARKET_DATA_CACHE_CONTROL):
+    """Return a bodyless 304 when the client already holds ``token``, else None."""
+    if not ENABLE_HTTP_CACHE or token is None or not request.if_none_match.contains_weak(token):
+        return None
+    return _set_cache_headers(app.response_class(status=304), token, cache_control)
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso_date(date_str: str) -> Optional[date]:
     try:
         return datetime.strptime(date_str, "%Y-%m-%d").date()
     except ValueError:
+        return None
+
+
+def _parse_date(date_str: Optional[str]) -> date:
+    if not date_str:
+        return datetime.utcnow().date()
+    parsed = _parse_iso_date(date_str)
+    if parsed is None:
         return datetime.utcnow().date()
+    return parsed
 
 
 def _get_week_end(date_obj: date) -> date:
-    monday = date_obj - timedelta(days=date_obj.weekday())
-    return monday + timedelta(days=6)
+    # Sunday of the same Monday-based week, computed on the day ordinal
+    return date.fromordinal(date_obj.toordinal() - date_obj.weekday() + 6)
 
 
 def _format_week_label(sunday_date: date) -> str:
     return f"Week of {sunday_date.strftime('%m/%d/%y')}"
 
 
+@lru_cache(maxsize=4096)
+def _week_info_for(base_date: date) -> Tuple[str, str]:
+    week_end_date = _get_week_end(base_date)
+    return week_end_date.isoformat(), _format_week_label(week_end_date)
+
+
 def _calculate_week_info(date_str: Optional[object] = None) -> Dict[str, str]:
     if isinstance(date_str, datetime):
         base_date = date_str.date()
@@ -693,10 +1343,10 @@ def _calculate_week_info(date_str: Optional[object] = None) -> Dict[str, str]:
         base_date = date_str
     else:
         base_date = _parse_date(date_str if isinstance(date_str, str) else None)
-    week_end_date = _get_week_end(base_date)
+    week_end, week_label = _week_info_for(base_date)
     return {
-        "week_end": week_end_date.isoformat(),
-        "week_label": _format_week_label(week_end_date),
+        "week_end": week_end,
+        "week_label": week_label,
     }
 
 
@@ -705,24 +1355,39 @@ def _apply_week_defaults(row: Dict[str, Any]) -> None:
         return
     source_date = row.get("date_spotted") or row.get("date_added")
     base_date = _parse_date(source_date if isinstance(source_date, str) else None)
-    week_info = _calculate_week_info(base_date)
+    week_end, week_label = _week_info_for(base_date)
     if not row.get("date_added"):
         row["date_added"] = base_date.isoformat()
-    row["week_end"] = week_info["week_end"]
-    row["week_label"] = week_info["week_label"]
+    row["week_end"] = week_end
+    row["week_label"] = week_label
 
 
 def _initialize_storage() -> None:
     _ensure_file()
-    if not _index_state["weeks"]:
+    # Older index files may have ordered by_symbol differently; binary inserts rely on this order
+    for entries in _index_state["by_symbol"].values():
+        entries.sort(key=_symbol_entry_key)
+    if not _index_state["weeks"] or not _index_matches_list_files():
         if not _rebuild_index_from_files():
             latest = _calculate_week_info(datetime.utcnow().date())["week_end"]
             _ensure_week_entry(latest)
             _save_index(_index_state)
+    for week in _available_weeks(desc=False):
+        for lt in VALID_LIST_TYPES:
+            _load_list_records(week, lt)
+
+
+def _tracked_symbols() -> List[str]:
+    # Every symbol on any list; by_symbol keys are already normalized
+    return list(_index_state["by_symbol"])
 
 
 _initialize_storage()
-price_cache = PriceCache(ttl_seconds=PRICE_TTL_SECONDS)
+price_cache = PriceCache(
+    ttl_seconds=PRICE_TTL_SECONDS,
+    warm_symbols=_tracked_symbols,
+    warm_interval=PRICE_WARM_INTERVAL_SECONDS,
+)
 
 
 def _ensure_prices(prices: Dict[str, Optional[float]], symbols: List[str]) -> Dict[str, Optional[float]]:
@@ -747,12 +1412,53 @@ def index():
     return render_template("index.html")
 
 
+_prefetch_pool: Optional[ThreadPoolExecutor] = None
+_prefetch_pool_lock = threading.Lock()
+# symbol -> loads still running; bounds the queue and keeps repeat hits from re-queuing
+_prefetch_inflight: Dict[str, int] = {}
+PREFETCH_MAX_SYMBOLS = 4
+
+
+def _prefetch_finished(sym: str, _future) -> None:
+    with _prefetch_pool_lock:
+        remaining = _prefetch_inflight.get(sym, 1) - 1
+        if remaining > 0:
+            _prefetch_inflight[sym] = remaining
+        else:
+            _prefetch_inflight.pop(sym, None)
+
+
+def _prefetch_detail_data(sym: str) -> None:
+    global _prefetch_pool
+    # Only symbols someone tracks; crawlers walking /stocks/<anything> must not drive upstream traffic
+    if not _index_state["by_symbol"].get(sym):
+        return
+    loads = (
+        (fetch_overview, (sym,), {}),
+        (fetch_price_history, (sym, "1d"), {"columnar": True}),
+        (fetch_news, (sym,), {}),
+    )
+    with _prefetch_pool_lock:
+        if sym in _prefetch_inflight or len(_prefetch_inflight) >= PREFETCH_MAX_SYMBOLS:
+            return
+        if _prefetch_pool is None:
+            _prefetch_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="detail-prefetch")
+        pool = _prefetch_pool
+        _prefetch_inflight[sym] = len(loads)
+    # Same cache keys the page requests next, so its calls join these loads (or hit their
+    # results) instead of starting their own; failures stay in the discarded futures
+    for fn, args, kwargs in loads:
+        pool.submit(fn, *args, **kwargs).add_done_callback(lambda future: _prefetch_finished(sym, future))
+
+
 @app.route("/stocks/<symbol>")
 def stock_detail(symbol: str):
     try:
         sym = _normalize_symbol(symbol)
     except ValueError:
         abort(404)
+    if PREFETCH_DETAIL_DATA:
+        _prefetch_detail_data(sym)
     return render_template("stock_detail.html", symbol=sym)
 
 
@@ -765,9 +1471,8 @@ def position_sizer():
 @app.route("/api/stocks", methods=["GET"])
 def get_stocks():
     weeks = _resolve_weeks_from_request()
-    grouped = _load_grouped_lists(weeks)
-    response = jsonify(grouped)
-    return _maybe_set_cache_headers(response, state_version, ",".join(weeks))
+    key = ("stocks", state_version, tuple(weeks))
+    return _cached_json_response(key, lambda: _load_grouped_lists(weeks))
 
 
 @app.route("/api/stocks/search", methods=["GET"])
@@ -775,44 +1480,41 @@ def search_stocks():
     raw_query = request.args.get("q")
     query = (raw_query or "").strip().upper()
     if not query:
-        return jsonify({"results": []})
+        return _json_response({"results": []})
     if len(query) > 32:
         return _json_error("query must be 32 characters or fewer", 400)
 
     list_filter_raw = request.args.get("list")
+    list_filter = _normalize_list_type(list_filter_raw) if list_filter_raw else None
+    if "\t" in query:
+        return _json_response({"results": []})
     weeks = _resolve_weeks_from_request()
-    universe = _read_stocks(weeks=weeks)
-    if list_filter_raw:
-        list_filter = _normalize_list_type(list_filter_raw)
-        universe = [row for row in universe if _normalize_list_type(row.get("list_type")) == list_filter]
-
-    matches: List[Dict[str, Optional[str]]] = []
-    upper_query = query.upper()
-    for stock in universe:
-        if not isinstance(stock, dict):
-            continue
-        symbol = (stock.get("symbol") or "").strip().upper()
-        if not symbol:
-            continue
-        if upper_query in symbol:
-            matches.append({
-                "id": stock.get("id"),
-                "symbol": symbol,
-                "list_type": _normalize_list_type(stock.get("list_type")),
-            })
+    buffer = _cached_value(
+        ("search", state_version, tuple(weeks), list_filter),
+        lambda: _build_symbol_scan_buffer(weeks, list_filter),
+    )
 
-    matches.sort(key=lambda item: item["symbol"])
-    return jsonify({"results": matches[:10]})
+    pattern = re.compile(rb"^([^\t\n]*" + re.escape(query.encode("utf-8")) + rb"[^\t\n]*)\t([^\t\n]*)\t([^\t\n]*)$", re.M)
+    matches = [tuple(part.decode("utf-8") for part in match.groups()) for match in pattern.finditer(buffer)]
+    results = [
+        {"id": stock_id or None, "symbol": symbol, "list_type": list_type}
+        for symbol, stock_id, list_type in heapq.nsmallest(10, matches)
+    ]
+    return _json_response({"results": results})
 
 
 @app.route("/api/weeks", methods=["GET"])
 def get_weeks():
+    return _cached_json_response(("weeks", state_version), _build_week_list)
+
+
+def _build_week_list() -> List[Dict[str, str]]:
     weeks = []
     for week_end in _available_weeks(desc=True):
         info = _index_state["weeks"].get(week_end, {})
         week_label = info.get("label") or _format_week_label(_parse_date(week_end))
         weeks.append({"week_end": week_end, "week_label": week_label})
-    return jsonify(weeks)
+    return weeks
 
 
 @app.route("/api/stocks", methods=["POST"])
@@ -828,11 +1530,11 @@ def create_stock():
         list_type = "B"
 
     if not symbol:
-        return jsonify({"error": "symbol is required"}), 400
+        return _json_error("symbol is required", 400)
     try:
         initial_price = float(initial_price)
     except Exception:
-        return jsonify({"error": "initial_price must be a number"}), 400
+        return _json_error("initial_price must be a number", 400)
 
     stock = {
         "id": str(uuid.uuid4()),
@@ -844,7 +1546,6 @@ def create_stock():
         "date_added": datetime.utcnow().date().isoformat(),
         "list_type": list_type,
     }
-    _apply_week_defaults(stock)
 
     try:
         stored = _upsert_record(stock)
@@ -855,7 +1556,7 @@ def create_stock():
     current_price = prices.get(symbol)
     pct = calculate_percent_change(initial_price, current_price)
 
-    return jsonify({"stock": stored, "current_price": current_price, "percent_change": pct})
+    return _json_response({"stock": stored, "current_price": current_price, "percent_change": pct})
 
 
 @app.route("/api/stocks/<stock_id>", methods=["PUT"])
@@ -863,7 +1564,7 @@ def update_stock(stock_id: str):
     payload = request.get_json(force=True, silent=True) or {}
     target = _get_stock_by_id(stock_id)
     if not target:
-        return jsonify({"error": "stock not found"}), 404
+        return _json_error("stock not found", 404)
     current_symbol, current_row = target
     updated = dict(current_row)
 
@@ -871,13 +1572,13 @@ def update_stock(stock_id: str):
     if "symbol" in payload:
         sym = (payload.get("symbol") or "").strip().upper()
         if not sym:
-            return jsonify({"error": "symbol cannot be empty"}), 400
+            return _json_error("symbol cannot be empty", 400)
         updated["symbol"] = sym
     if "initial_price" in payload:
         try:
             updated["initial_price"] = float(payload.get("initial_price"))
         except Exception:
-            return jsonify({"error": "initial_price must be a number"}), 400
+            return _json_error("initial_price must be a number", 400)
     if "reason" in payload:
         updated["reason"] = (payload.get("reason") or "").strip()
     if "date_spotted" in payload:
@@ -890,15 +1591,14 @@ def update_stock(stock_id: str):
             lt = "B"
         updated["list_type"] = lt
 
-    _apply_week_defaults(updated)
-
+    # _upsert_record re-derives week_end/week_label from the (possibly edited) dates
     try:
         prev_meta = _index_state["by_id"].get(stock_id, {})
         stored = _upsert_record(updated, previous=prev_meta)
     except Exception:
         return _json_error("failed to persist stock changes", 500)
 
-    return jsonify(stored)
+    return _json_response(stored)
 
 
 @app.route("/api/stocks/<stock_id>", methods=["DELETE"])
@@ -908,56 +1608,69 @@ def delete_stock(stock_id: str):
     except Exception:
         removed = False
     if not removed:
-        return jsonify({"error": "stock not found"}), 404
-    return jsonify({"success": True})
+        return _json_error("stock not found", 404)
+    return _json_response({"success": True})
+
+
+def _build_price_entries(weeks: List[str]) -> Tuple[List[Tuple[str, str, Any]], List[str]]:
+    entries: List[Tuple[str, str, Any]] = []
+    symbols: Dict[str, None] = {}
+    for row in _read_stocks(weeks=weeks):
+        # Stored rows are normalized by _upsert_record, so ids and symbols are used as-is
+        stock_id = row.get("id")
+        symbol = row.get("symbol")
+        if not stock_id or not symbol:
+            continue
+        entries.append((stock_id, symbol, row.get("initial_price")))
+        symbols[symbol] = None
+    return entries, list(symbols)
 
 
 @app.route("/api/stocks/prices", methods=["GET"])
 def get_prices():
     weeks = _resolve_weeks_from_request()
-    grouped = _load_grouped_lists(weeks)
-    rows = []
-    for lt in VALID_LIST_TYPES:
-        rows.extend(grouped.get(lt, []))
-    symbols = []
-    sym_to_initial: Dict[str, Optional[float]] = {}
-    id_to_symbol: Dict[str, str] = {}
-    for row in rows:
-        stock_id = str(row.get("id") or "").strip()
-        symbol = _normalize_symbol_key(row.get("symbol"))
-        if not stock_id or not symbol:
-            continue
-        id_to_symbol[stock_id] = symbol
-        symbols.append(symbol)
-        sym_to_initial[stock_id] = row.get("initial_price")
-    prices = price_cache.get_many(symbols)
-    prices = _ensure_prices(prices, symbols)
-    result = []
-    for stock_id, symbol in id_to_symbol.items():
-        initial = sym_to_initial.get(stock_id)
-        current = prices.get(symbol)
-        pct = calculate_percent_change(initial, current)
-        result.append({
-            "id": stock_id,
-            "symbol": symbol,
-            "current_price": current,
-            "percent_change": pct,
-        })
-    response = jsonify(result)
-    return _maybe_set_cache_headers(response, state_version, "prices", ",".join(weeks))
+    # Rows only change with state_version; price refreshes reuse the same entry list
+    entries, unique_symbols = _cached_value(
+        ("price_entries", state_version, tuple(weeks)), lambda: _build_price_entries(weeks)
+    )
+    prices = price_cache.get_many(unique_symbols, normalized=True)
+    prices = _ensure_prices(prices, unique_symbols)
+
+    def _rows():
+        currents = [prices.get(symbol) for _, symbol, _ in entries]
+        changes = calculate_percent_changes([initial for _, _, initial in entries], currents)
+        for (stock_id, symbol, _), current, change in zip(entries, currents, changes):
+            yield {
+                "id": stock_id,
+                "symbol": symbol,
+                "current_price": current,
+                "percent_change": change,
+            }
+
+    def _serialize() -> bytes:
+        if len(entries) <= PRICES_INCREMENTAL_THRESHOLD:
+            return _json_dumps(list(_rows()), pretty=False)
+        # Large lists: encode row by row so the full list of dicts never exists at once
+        return b"[" + b",".join(_json_dumps(row, pretty=False) for row in _rows()) + b"]"
+
+    key = ("prices", state_version, price_cache.epoch, tuple(weeks))
+    return _cached_payload_response(key, _serialize)
 
 
 @app.route("/api/prices", methods=["GET"])
 def get_prices_cached():
     raw = request.args.get("symbols") or ""
-    symbols = [s.strip().upper() for s in raw.split(",") if s and s.strip()]
+    symbols = list(dict.fromkeys(_SYMBOL_TOKEN_RE.findall(raw.upper())))
     if not symbols:
-        return jsonify({"prices": {}})
-    prices = price_cache.get_many(symbols)
+        return _json_response({"prices": {}})
+    prices = dict(zip(symbols, price_cache.get_many_ordered(symbols)))
     prices = _ensure_prices(prices, symbols)
-    ordered = {sym: prices.get(sym) for sym in symbols}
-    response = jsonify({"prices": ordered})
-    return _maybe_set_cache_headers(response, state_version, "prices", ",".join(symbols))
+    # Prices move independently of state_version, so the tag follows the cache epoch too
+    token = _make_etag_token(state_version, "prices", price_cache.epoch, symbols)
+    not_modified = _not_modified_response(token, DEFAULT_CACHE_CONTROL)
+    if not_modified is not None:
+        return not_modified
+    return _set_cache_headers(_json_response({"prices": prices}), token)
 
 
 @app.route("/api/stocks/<symbol>/overview", methods=["GET"])
@@ -967,7 +1680,7 @@ def get_stock_overview(symbol: str):
     except ValueError as exc:
         return _json_error(str(exc), 400)
     data = fetch_overview(sym)
-    return jsonify(data)
+    return _json_response(data)
 
 
 @app.route("/api/stocks/<symbol>/snapshot", methods=["GET"])
@@ -976,35 +1689,29 @@ def get_stock_snapshot(symbol: str):
         sym = _normalize_symbol(symbol)
     except ValueError as exc:
         return _json_error(str(exc), 400)
+    # Serve whatever price is cached and let the cache worker refresh it; the request
+    # never waits on the upstream quote
+    current_price = price_cache.get_many([sym], normalized=True).get(sym)
+    # The body only changes with the stored rows or a cached price refresh
+    token = _make_etag_token("snapshot", sym, state_version, price_cache.epoch)
+    not_modified = _not_modified_response(token, DEFAULT_CACHE_CONTROL)
+    if not_modified is not None:
+        return not_modified
+
     entries = _index_state["by_symbol"].get(sym)
     record = None
 
-    def _entry_key(entry: Dict[str, Any]) -> Tuple[str, str]:
-        reference = entry.get("date_spotted") or entry.get("date_added") or entry.get("week")
-        return (reference, entry.get("week"))
-
     if entries:
-        latest_entry = max(entries, key=_entry_key)
+        latest_entry = entries[-1]
         week = latest_entry.get("week")
         list_type = _normalize_list_type(latest_entry.get("list"))
         stock_id = latest_entry.get("id")
         if week and list_type:
-            records = _load_list_records(week, list_type)
-            for candidate in records:
-                if str(candidate.get("id")) == str(stock_id):
-                    record = dict(candidate)
-                    break
+            record = _find_list_record(week, list_type, stock_id)
     else:
-        # Fallback for tests or manual data edits: scan in-memory snapshot
-        candidates = [
-            row for row in _read_stocks()
-            if isinstance(row, dict) and _normalize_symbol_key(row.get("symbol")) == sym
-        ]
-        if candidates:
-            record = max(
-                candidates,
-                key=lambda stock: _parse_date(stock.get("week_end") or stock.get("date_added") or stock.get("date_spotted"))
-            )
+        # Fallback for tests or manual data edits: latest record per symbol in the current week
+        latest = _cached_value(("latest_by_symbol", state_version), _build_latest_by_symbol)
+        record = latest.get(sym)
 
     if not record:
         return _json_error("stock not found", 404)
@@ -1015,15 +1722,6 @@ def get_stock_snapshot(symbol: str):
     except (TypeError, ValueError):
         initial_price = None
 
-    prices = price_cache.get_many([sym], schedule_refresh=False)
-    current_price = prices.get(sym)
-    if current_price is None:
-        try:
-            fresh = get_current_prices([sym]) or {}
-            current_price = fresh.get(sym)
-            price_cache.prime(sym, current_price)
-        except Exception:
-            current_price = None
     percent_change = calculate_percent_change(initial_price, current_price)
 
     payload = {
@@ -1036,18 +1734,33 @@ def get_stock_snapshot(symbol: str):
         "current_price": current_price,
         "percent_change": percent_change,
     }
-    return jsonify(payload)
+    return _set_cache_headers(_json_response(payload), token)
 
 
 @app.route("/api/stocks/<symbol>/history", methods=["GET"])
 def get_stock_history(symbol: str):
     interval = request.args.get("interval") or "1d"
+    layout = (request.args.get("format") or "points").strip().lower()
+    if layout not in HISTORY_FORMATS:
+        return _json_error("format must be 'points' or 'columns'", 400)
     try:
         sym = _normalize_symbol(symbol)
-        data = fetch_price_history(sym, interval)
     except ValueError as exc:
         return _json_error(str(exc), 400)
-    return jsonify(data)
+    key = _history_cache_key(sym, interval, layout == "columns")
+    parts = ("history", sym, interval, layout)
+    not_modified = _not_modified_response(_market_data_etag(key, HISTORY_TTL_SECONDS, *parts))
+    if not_modified is not None:
+        return not_modified
+    try:
+        if layout == "columns":
+            data = fetch_price_history(sym, interval, columnar=True)
+        else:
+            data = fetch_price_history(sym, interval)
+    except ValueError as exc:
+        return _json_error(str(exc), 400)
+    token = _market_data_etag(key, HISTORY_TTL_SECONDS, *parts)
+    return _set_market_data_headers(_json_records_response(data, "points"), data, token, _has_history_points)
 
 
 @app.route("/api/stocks/<symbol>/indicators", methods=["GET"])
@@ -1060,15 +1773,25 @@ def get_stock_indicators(symbol: str):
         return _json_error("windows parameter must include at least one positive integer", 400)
     try:
         sym = _normalize_symbol(symbol)
-        if indicator_type == "sma":
-            data = compute_sma(sym, interval, windows)
-        elif indicator_type == "ema":
-            data = compute_ema(sym, interval, windows)
-        else:
-            return _json_error("type must be 'sma' or 'ema'", 400)
     except ValueError as exc:
         return _json_error(str(exc), 400)
-    return jsonify(data)
+    if indicator_type == "sma":
+        compute = compute_sma
+    elif indicator_type == "ema":
+        compute = compute_ema
+    else:
+        return _json_error("type must be 'sma' or 'ema'", 400)
+    key = _indicator_cache_key(indicator_type, sym, interval, tuple(windows))
+    parts = ("indicators", sym, interval, indicator_type, windows)
+    not_modified = _not_modified_response(_market_data_etag(key, INDICATOR_TTL_SECONDS, *parts))
+    if not_modified is not None:
+        return not_modified
+    try:
+        data = compute(sym, interval, windows)
+    except ValueError as exc:
+        return _json_error(str(exc), 400)
+    token = _market_data_etag(key, INDICATOR_TTL_SECONDS, *parts)
+    return _set_market_data_headers(_json_response(data), data, token, _has_indicator_values)
 
 
 @app.route("/api/stocks/<symbol>/rsi", methods=["GET"])
@@ -1081,10 +1804,19 @@ def get_stock_rsi(symbol: str):
         return _json_error("period must be an integer", 400)
     try:
         sym = _normalize_symbol(symbol)
+    except ValueError as exc:
+        return _json_error(str(exc), 400)
+    key = _indicator_cache_key("rsi", sym, interval, period)
+    parts = ("rsi", sym, interval, period)
+    not_modified = _not_modified_response(_market_data_etag(key, INDICATOR_TTL_SECONDS, *parts))
+    if not_modified is not None:
+        return not_modified
+    try:
         data = compute_rsi(sym, interval, period)
     except ValueError as exc:
         return _json_error(str(exc), 400)
-    return jsonify(data)
+    token = _market_data_etag(key, INDICATOR_TTL_SECONDS, *parts)
+    return _set_market_data_headers(_json_response(data), data, token, _has_indicator_values)
 
 
 @app.route("/api/stocks/<symbol>/news", methods=["GET"])
@@ -1101,10 +1833,9 @@ def get_stock_news(symbol: str):
         articles = fetch_news(sym, limit=limit or 10)
     except ValueError as exc:
         return _json_error(str(exc), 400)
-    return jsonify({"symbol": sym, "articles": articles})
+    return _json_response({"symbol": sym, "articles": articles})
 
 
 if __name__ == "__main__":
-    # Create data file on first run
-    _ensure_file()
+    # Development server only; storage is initialized at import. See wsgi.py for production.
     app.run(host="127.0.0.1", port=5000, debug=True)
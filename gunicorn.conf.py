@@ -0,0 +1,10 @@
+import os
+
+bind = os.environ.get("BIND", "127.0.0.1:5000")
+# Week lists, the index and the response cache live in process memory, so a second
+# worker would serve stale data after another worker's writes; scale with threads instead
+workers = int(os.environ.get("WEB_CONCURRENCY", "1"))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", "8"))
+# Load storage and the index once in the master before forking
+preload_app = True
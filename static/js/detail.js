@@ -215,10 +215,10 @@
   async function loadHistory() {
     const interval = state.data.currentInterval;
     try {
-      const res = await fetch(`/api/stocks/${encodeURIComponent(symbol)}/history?interval=${encodeURIComponent(interval)}`);
+      const res = await fetch(`/api/stocks/${encodeURIComponent(symbol)}/history?interval=${encodeURIComponent(interval)}&format=columns`);
       if (!res.ok) throw new Error('Failed to fetch price history');
       const data = await res.json();
-      state.data.baseHistory = Array.isArray(data.points) ? data.points : [];
+      state.data.baseHistory = data.columns && Array.isArray(data.columns.date) ? data.columns : [];
       state.ui.shouldResetZoom = true;
       updatePriceChart();
       if (elements.lastUpdatedAt) {
@@ -783,6 +783,17 @@
   }
 
   function mapHistoryToPoints(history, key) {
+    if (history && Array.isArray(history.date)) {
+      // Columnar payload: one array per field, aligned by index
+      const values = Array.isArray(history[key]) ? history[key] : [];
+      const points = [];
+      history.date.forEach((date, index) => {
+        if (date && values[index] != null) {
+          points.push({ x: new Date(date), y: Number(values[index]) });
+        }
+      });
+      return points;
+    }
     if (!Array.isArray(history)) return [];
     return history
       .filter((item) => item && item.date && item[key] != null)
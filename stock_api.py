@@ -1,18 +1,137 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+import logging
+import os
+import random
+import re
+import threading
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 
 import numpy as np
 import pandas as pd
 import yfinance as yf
 
+try:
+    from yfinance.exceptions import YFRateLimitError
+except Exception:  # pragma: no cover - older yfinance releases
+    YFRateLimitError = None
+
+try:
+    from curl_cffi.requests.exceptions import ConnectionError as CurlConnectionError, Timeout as CurlTimeout
+except Exception:  # pragma: no cover - curl_cffi ships with yfinance but is not required here
+    CurlConnectionError = CurlTimeout = None
+
+try:
+    # Shared session plus cookie/crumb handling for direct Yahoo endpoint calls
+    from yfinance.data import YfData
+except Exception:  # pragma: no cover - internal to yfinance, may move between versions
+    YfData = None
+
+try:
+    from numba import njit
+except Exception:  # pragma: no cover - numba is optional
+    njit = None
+
+
+logger = logging.getLogger(__name__)
 
 ALLOWED_INTERVALS = {"1d", "1wk"}
 DEFAULT_INTERVAL = "1d"
 MAX_NEWS_ITEMS = 10
+HISTORY_YEARS = 4
+# Weekly bars move slowly, so they can be reused for longer than daily ones
+HISTORY_CACHE_TTL_SECONDS = {"1d": 60.0, "1wk": 600.0}
+HISTORY_CACHE_MAX_ENTRIES = 256
+# Downloaded history is kept on disk and only topped up with new bars;
+# HISTORY_STORE_PATH="" turns the store off
+_DATA_ROOT = os.path.abspath(
+    os.getenv("STOCKS_PATH") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+)
+HISTORY_STORE_DIR: Optional[str] = os.getenv("HISTORY_STORE_PATH", os.path.join(_DATA_ROOT, "history")) or None
+# Splits and dividends restate past bars, so a store older than this is downloaded again in full.
+# The file's mtime marks the last full download; top-ups leave it alone
+HISTORY_STORE_MAX_AGE_SECONDS = 24 * 3600
+_STORE_NAME_RE = re.compile(r"[^A-Z0-9.^=\-]")
+PRICE_LOOKUP_WORKERS = 16
+QUOTE_URL = "https://query1.finance.yahoo.com/v7/finance/quote"
+# Yahoo's quote endpoint answers up to this many symbols per GET
+QUOTE_BATCH_SIZE = 20
+QUOTE_SUMMARY_URL = "https://query2.finance.yahoo.com/v10/finance/quoteSummary"
+# Only the modules behind the name/profile fields we surface, not the full .info set
+QUOTE_SUMMARY_MODULES = "assetProfile,quoteType,price"
+# Company metadata barely changes; the full .info scrape is the slowest yfinance call we make
+INFO_CACHE_TTL_SECONDS = 600.0
+INFO_CACHE_MAX_ENTRIES = 256
+# Ticker objects memoize what they fetch, so they are only reused for a short window
+TICKER_REUSE_SECONDS = 60.0
+TICKER_CACHE_MAX_ENTRIES = 512
+# fast_info depends on the installed yfinance version, not on the ticker
+_HAS_FAST_INFO = hasattr(yf.Ticker, "fast_info")
+# Shared budget for outbound Yahoo requests across all request threads
+UPSTREAM_REQUESTS_PER_SECOND = 8.0
+UPSTREAM_BURST = 16
+# Transient upstream failures are retried with capped exponential backoff plus jitter
+UPSTREAM_RETRIES = 2
+UPSTREAM_RETRY_BASE_SECONDS = 0.5
+UPSTREAM_RETRY_CAP_SECONDS = 4.0
+_TRANSIENT_ERRORS = tuple(
+    exc
+    for exc in (YFRateLimitError, CurlConnectionError, CurlTimeout, ConnectionError, TimeoutError)
+    if exc is not None
+)
+
+_history_cache: Dict[Tuple[str, str], Tuple[float, pd.DataFrame]] = {}
+_history_cache_lock = threading.Lock()
+_info_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_info_cache_lock = threading.Lock()
+_ticker_cache: Dict[str, Tuple[float, Any]] = {}
+_ticker_cache_lock = threading.Lock()
+
+
+class _TokenBucket:
+    """Token bucket; acquire() only blocks once the burst allowance is spent."""
+
+    def __init__(self, rate: float, capacity: int, clock=time.monotonic, sleep=time.sleep) -> None:
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve the token up front so concurrent callers queue behind each other
+            self._tokens -= 1.0
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+_upstream_limiter = _TokenBucket(UPSTREAM_REQUESTS_PER_SECOND, UPSTREAM_BURST)
+
+
+def _upstream_call(fetch):
+    """Run one outbound Yahoo call under the rate limit, retrying transient failures."""
+    for attempt in range(UPSTREAM_RETRIES + 1):
+        _upstream_limiter.acquire()
+        try:
+            return fetch()
+        except _TRANSIENT_ERRORS:
+            if attempt >= UPSTREAM_RETRIES:
+                raise
+            delay = min(UPSTREAM_RETRY_CAP_SECONDS, UPSTREAM_RETRY_BASE_SECONDS * 2**attempt)
+            time.sleep(delay + random.uniform(0, UPSTREAM_RETRY_BASE_SECONDS))
 
 
 def _normalize_symbol(symbol: str) -> str:
@@ -29,36 +148,65 @@ def _validate_interval(interval: Optional[str]) -> str:
     return iv
 
 
-def _history_period_for(interval: str) -> str:
-    # Weekly history benefits from a slightly longer pull to ensure 4y coverage
-    return "5y" if interval == "1wk" else "4y"
+@lru_cache(maxsize=8)
+def _history_start(interval: str, today: date) -> str:
+    # Ask for exactly HISTORY_YEARS of bars; weekly gets one extra bar so the oldest week is whole
+    start = today - timedelta(days=365 * HISTORY_YEARS + 1)
+    if interval == "1wk":
+        start -= timedelta(days=7)
+    return start.isoformat()
+
+
+_HISTORY_COLUMNS = (
+    ("open", "Open"),
+    ("high", "High"),
+    ("low", "Low"),
+    ("close", "Close"),
+    ("adj_close", "Adj Close"),
+    ("volume", "Volume"),
+)
+
+
+def _history_dates(history: pd.DataFrame) -> List[Optional[str]]:
+    # yfinance returns the bar timestamps as a "Date" index; format them all in one pass
+    if history.index.name == "Date":
+        raw = history.index
+    elif "Date" in history.columns:
+        raw = history["Date"]
+    else:
+        return [None] * len(history)
+    try:
+        dates = pd.DatetimeIndex(pd.to_datetime(raw, errors="coerce"))
+    except Exception:
+        return [None] * len(history)
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+    return [value if isinstance(value, str) else None for value in dates.strftime("%Y-%m-%d")]
+
+
+def _optional_floats(values: Any) -> List[Optional[float]]:
+    # NaN and non-numeric cells become None, matching _safe_float, without a per-cell call
+    array = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=np.float64)
+    boxed = array.astype(object)
+    boxed[np.isnan(array)] = None
+    return boxed.tolist()
+
+
+def _history_to_columns(history: pd.DataFrame) -> Dict[str, List[Optional[Any]]]:
+    """Column-oriented form of a history frame: one list per field, aligned by position."""
+    size = len(history)
+    columns: Dict[str, List[Optional[Any]]] = {"date": _history_dates(history) if size else []}
+    for key, name in _HISTORY_COLUMNS:
+        columns[key] = _optional_floats(history[name].to_numpy()) if name in history.columns else [None] * size
+    return columns
 
 
 def _history_to_records(history: pd.DataFrame) -> List[Dict[str, Optional[float]]]:
     if history.empty:
         return []
-    data = history.reset_index()
-    records: List[Dict[str, Optional[float]]] = []
-    for _, row in data.iterrows():
-        # yfinance returns Timestamp for the index. Convert to ISO date string.
-        raw_date = row.get("Date")
-        if isinstance(raw_date, (pd.Timestamp, datetime)):
-            date_str = raw_date.tz_localize(None).strftime("%Y-%m-%d")
-        else:
-            try:
-                date_str = pd.to_datetime(raw_date).strftime("%Y-%m-%d")
-            except Exception:
-                date_str = None
-        records.append({
-            "date": date_str,
-            "open": _safe_float(row.get("Open")),
-            "high": _safe_float(row.get("High")),
-            "low": _safe_float(row.get("Low")),
-            "close": _safe_float(row.get("Close")),
-            "adj_close": _safe_float(row.get("Adj Close")),
-            "volume": _safe_float(row.get("Volume")),
-        })
-    return records
+    columns = _history_to_columns(history)
+    keys = list(columns)
+    return [dict(zip(keys, row)) for row in zip(*columns.values())]
 
 
 def _safe_float(value: Optional[float]) -> Optional[float]:
@@ -117,21 +265,175 @@ def _extract_thumbnail_url(article: Dict[str, Any]) -> Optional[str]:
     return None
 
 
-def _download_history(symbol: str, interval: str) -> pd.DataFrame:
-    ticker = yf.Ticker(symbol)
-    period = _history_period_for(interval)
-    history = ticker.history(period=period, interval=interval, auto_adjust=False)
-    # Ensure numeric columns are floats
-    return history.astype(float, errors="ignore")
+def _cached_history(symbol: str, interval: str) -> pd.DataFrame:
+    # One download serves /history, /indicators and /rsi for the same symbol; callers treat it as read-only
+    key = (symbol, interval)
+    now = time.monotonic()
+    with _history_cache_lock:
+        cached = _history_cache.get(key)
+    if cached is not None and now - cached[0] < HISTORY_CACHE_TTL_SECONDS.get(interval, 60.0):
+        return cached[1]
+    history = _load_history(symbol, interval)
+    if not history.empty:
+        with _history_cache_lock:
+            if len(_history_cache) >= HISTORY_CACHE_MAX_ENTRIES:
+                _history_cache.clear()
+            _history_cache[key] = (now, history)
+    return history
+
+
+def _history_store_path(symbol: str, interval: str) -> Optional[str]:
+    if not HISTORY_STORE_DIR:
+        return None
+    return os.path.join(HISTORY_STORE_DIR, f"{_STORE_NAME_RE.sub('_', symbol)}_{interval}.csv")
+
+
+def _read_stored_history(path: str) -> Optional[pd.DataFrame]:
+    # Plain CSV rather than pickle: reading a file from the data directory must never run code
+    try:
+        stored = pd.read_csv(path, index_col=0, parse_dates=[0])
+    except Exception:
+        # Missing, truncated or hand-edited: fall back to a full download
+        return None
+    if stored.empty or not isinstance(stored.index, pd.DatetimeIndex):
+        return None
+    return stored
+
+
+def _stored_history_mtime(path: str) -> Optional[float]:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def _write_stored_history(path: str, history: pd.DataFrame, full_download_at: Optional[float] = None) -> None:
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Bars are kept as exchange wall-clock times; the timezone is reapplied on top-up
+        if getattr(history.index, "tz", None) is not None:
+            history = history.tz_localize(None)
+        history.to_csv(tmp_path)
+        if full_download_at is not None:
+            os.utime(tmp_path, (full_download_at, full_download_at))
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def _load_history(symbol: str, interval: str) -> pd.DataFrame:
+    """Stored bars topped up from the last stored bar onward; a full download when the store is stale."""
+    path = _history_store_path(symbol, interval)
+    full_download_at = _stored_history_mtime(path) if path else None
+    stored = None
+    if full_download_at is not None and time.time() - full_download_at < HISTORY_STORE_MAX_AGE_SECONDS:
+        stored = _read_stored_history(path)
+    if stored is None:
+        full_download_at = None
+        history = _download_history(symbol, interval)
+    else:
+        # The last stored bar may still have been forming, so it is fetched again and replaced
+        last_bar = pd.Timestamp(stored.index[-1]).date().isoformat()
+        try:
+            fresh = _download_history(symbol, interval, start=last_bar)
+        except Exception as exc:
+            # The stored bars are at most a day old; serve them rather than fail the request
+            logger.warning("History top-up failed for %s %s: %s", symbol, interval, exc)
+            return stored
+        if fresh.empty:
+            return stored
+        tz = getattr(fresh.index, "tz", None)
+        if tz is not None:
+            stored = stored.tz_localize(tz)
+        history = pd.concat([stored[stored.index < fresh.index[0]], fresh])
+        history = history.loc[_history_start(interval, datetime.utcnow().date()) :]
+    if path and not history.empty:
+        _write_stored_history(path, history, full_download_at)
+    return history
+
+
+def _ticker(symbol: str) -> Any:
+    """``yf.Ticker(symbol)``, shared by the history/overview/news paths for TICKER_REUSE_SECONDS."""
+    now = time.monotonic()
+    with _ticker_cache_lock:
+        cached = _ticker_cache.get(symbol)
+        if cached is not None and now - cached[0] < TICKER_REUSE_SECONDS:
+            return cached[1]
+        ticker = yf.Ticker(symbol)
+        if len(_ticker_cache) >= TICKER_CACHE_MAX_ENTRIES:
+            _ticker_cache.clear()
+        _ticker_cache[symbol] = (now, ticker)
+    return ticker
+
+
+def _cached_info(symbol: str) -> Dict[str, Any]:
+    """Return company metadata for ``symbol``, shared across callers for INFO_CACHE_TTL_SECONDS."""
+    now = time.monotonic()
+    with _info_cache_lock:
+        cached = _info_cache.get(symbol)
+    if cached is not None and now - cached[0] < INFO_CACHE_TTL_SECONDS:
+        return cached[1]
+    raw = _quote_summary(symbol)
+    if not raw:
+        try:
+            raw = _upstream_call(lambda: _ticker(symbol).info)
+        except Exception:
+            return {}
+    if not isinstance(raw, dict) or not raw:
+        return {}
+    with _info_cache_lock:
+        if len(_info_cache) >= INFO_CACHE_MAX_ENTRIES:
+            _info_cache.clear()
+        _info_cache[symbol] = (now, raw)
+    return raw
+
 
+def _quote_summary(symbol: str) -> Dict[str, Any]:
+    # Flattened QUOTE_SUMMARY_MODULES, keyed like .info; empty when the request fails
+    if YfData is None:
+        return {}
+    try:
+        payload = _upstream_call(
+            lambda: YfData().get_raw_json(
+                f"{QUOTE_SUMMARY_URL}/{symbol}",
+                params={"modules": QUOTE_SUMMARY_MODULES, "formatted": "false"},
+            )
+        )
+        results = payload["quoteSummary"]["result"] or []
+    except Exception:
+        return {}
+    if not results or not isinstance(results[0], dict):
+        return {}
+    info: Dict[str, Any] = {}
+    for module in results[0].values():
+        if isinstance(module, dict):
+            for key, value in module.items():
+                info.setdefault(key, value)
+    return info
 
-def fetch_price_history(symbol: str, interval: Optional[str] = None) -> Dict:
+
+def _download_history(symbol: str, interval: str, start: Optional[str] = None) -> pd.DataFrame:
+    ticker = _ticker(symbol)
+    if start is None:
+        start = _history_start(interval, datetime.utcnow().date())
+    # OHLC already arrive as float64; _optional_floats coerces Volume when the rows are built
+    return _upstream_call(lambda: ticker.history(start=start, interval=interval, auto_adjust=False))
+
+
+def fetch_price_history(symbol: str, interval: Optional[str] = None, columnar: bool = False) -> Dict:
+    """Bars for ``symbol`` as ``points`` (one dict per bar) or, if ``columnar``, as ``columns``."""
     sym = _normalize_symbol(symbol)
     iv = _validate_interval(interval)
     try:
-        history = _download_history(sym, iv)
+        history = _cached_history(sym, iv)
     except Exception:
         history = pd.DataFrame()
+    if columnar:
+        return {"symbol": sym, "interval": iv, "columns": _history_to_columns(history)}
     return {
         "symbol": sym,
         "interval": iv,
@@ -146,50 +448,160 @@ def _series_from_history(history: pd.DataFrame) -> pd.Series:
     return series
 
 
+def _sma_kernel(values: np.ndarray, window: int) -> np.ndarray:
+    # Matches Series.rolling(window, min_periods=1).mean(): NaNs are skipped, not propagated
+    n = values.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    total = 0.0
+    count = 0
+    for i in range(n):
+        value = values[i]
+        if not np.isnan(value):
+            total += value
+            count += 1
+        if i >= window:
+            dropped = values[i - window]
+            if not np.isnan(dropped):
+                total -= dropped
+                count -= 1
+        out[i] = total / count if count > 0 else np.nan
+    return out
+
+
+def _ewm_kernel(values: np.ndarray, alpha: float) -> np.ndarray:
+    # Matches Series.ewm(alpha=alpha, adjust=False).mean() with ignore_na=False
+    n = values.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    old_weight_factor = 1.0 - alpha
+    weighted = np.nan
+    old_weight = 1.0
+    for i in range(n):
+        value = values[i]
+        if not np.isnan(weighted):
+            old_weight *= old_weight_factor
+            if not np.isnan(value):
+                if weighted != value:
+                    weighted = (old_weight * weighted + alpha * value) / (old_weight + alpha)
+                old_weight = 1.0
+        elif not np.isnan(value):
+            weighted = value
+        out[i] = weighted
+    return out
+
+
+def _rsi_kernel(values: np.ndarray, period: int) -> np.ndarray:
+    n = values.shape[0]
+    up = np.empty(n, dtype=np.float64)
+    down = np.empty(n, dtype=np.float64)
+    if n > 0:
+        up[0] = np.nan
+        down[0] = np.nan
+    for i in range(1, n):
+        delta = values[i] - values[i - 1]
+        if np.isnan(delta):
+            up[i] = np.nan
+            down[i] = np.nan
+        else:
+            up[i] = delta if delta > 0.0 else 0.0
+            down[i] = -delta if delta < 0.0 else 0.0
+    roll_up = _ewm_kernel(up, 1.0 / period)
+    roll_down = _ewm_kernel(down, 1.0 / period)
+    out = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        if roll_down[i] == 0.0 or np.isnan(roll_down[i]) or np.isnan(roll_up[i]):
+            out[i] = np.nan
+        else:
+            out[i] = 100.0 - (100.0 / (1.0 + roll_up[i] / roll_down[i]))
+    return out
+
+
+if njit is not None:
+    # Eager signatures compile at import so the first request doesn't pay for JIT
+    _sma_kernel = njit("float64[:](float64[:], int64)", cache=True)(_sma_kernel)
+    _ewm_kernel = njit("float64[:](float64[:], float64)", cache=True)(_ewm_kernel)
+    _rsi_kernel = njit("float64[:](float64[:], int64)", cache=True)(_rsi_kernel)
+
+
+def _sma_many_kernel(values: np.ndarray, windows: np.ndarray) -> np.ndarray:
+    # One row per window, all computed inside a single compiled call over the same close array
+    out = np.empty((windows.shape[0], values.shape[0]), dtype=np.float64)
+    for w in range(windows.shape[0]):
+        out[w, :] = _sma_kernel(values, windows[w])
+    return out
+
+
+def _ewm_many_kernel(values: np.ndarray, alphas: np.ndarray) -> np.ndarray:
+    out = np.empty((alphas.shape[0], values.shape[0]), dtype=np.float64)
+    for w in range(alphas.shape[0]):
+        out[w, :] = _ewm_kernel(values, alphas[w])
+    return out
+
+
+if njit is not None:
+    _sma_many_kernel = njit("float64[:, :](float64[:], int64[:])", cache=True)(_sma_many_kernel)
+    _ewm_many_kernel = njit("float64[:, :](float64[:], float64[:])", cache=True)(_ewm_many_kernel)
+
+
+def _close_values(series: pd.Series) -> np.ndarray:
+    return np.ascontiguousarray(pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64))
+
+
+def _rolling_sma(close_series: pd.Series, windows: List[int]) -> List[np.ndarray]:
+    if njit is None:
+        return [close_series.rolling(window=window, min_periods=1).mean().to_numpy() for window in windows]
+    return list(_sma_many_kernel(_close_values(close_series), np.asarray(windows, dtype=np.int64)))
+
+
+def _rolling_ema(close_series: pd.Series, windows: List[int]) -> List[np.ndarray]:
+    if njit is None:
+        return [close_series.ewm(span=window, adjust=False).mean().to_numpy() for window in windows]
+    alphas = 2.0 / (np.asarray(windows, dtype=np.float64) + 1.0)
+    return list(_ewm_many_kernel(_close_values(close_series), alphas))
+
+
+def _rolling_rsi(close_series: pd.Series, period: int) -> pd.Series:
+    values = _close_values(close_series)
+    if njit is not None:
+        return pd.Series(_rsi_kernel(values, period))
+    # One pass each for gains and losses; NaN deltas stay NaN through np.maximum
+    delta = np.diff(values, prepend=np.nan)
+    up = np.maximum(delta, 0.0)
+    down = np.maximum(-delta, 0.0)
+    roll_up = pd.Series(up).ewm(alpha=1 / period, adjust=False).mean().to_numpy()
+    roll_down = pd.Series(down).ewm(alpha=1 / period, adjust=False).mean().to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = roll_up / np.where(roll_down == 0.0, np.nan, roll_down)
+    return pd.Series(100.0 - (100.0 / (1.0 + rs)))
+
+
 def compute_sma(symbol: str, interval: str, windows: Iterable[int]) -> Dict:
-    sym = _normalize_symbol(symbol)
-    iv = _validate_interval(interval)
-    history = pd.DataFrame()
-    try:
-        history = _download_history(sym, iv)
-    except Exception:
-        history = pd.DataFrame()
-    close_series = _series_from_history(history)
-    records = []
-    if close_series.empty:
-        return {"symbol": sym, "interval": iv, "indicators": records}
-    for window in windows:
-        if window <= 0:
-            continue
-        sma_series = close_series.rolling(window=window, min_periods=1).mean()
-        records.append({
-            "type": "sma",
-            "window": window,
-            "values": _series_to_list(sma_series, history)
-        })
-    return {"symbol": sym, "interval": iv, "indicators": records}
+    return _compute_moving_averages("sma", _rolling_sma, symbol, interval, windows)
 
 
 def compute_ema(symbol: str, interval: str, windows: Iterable[int]) -> Dict:
+    return _compute_moving_averages("ema", _rolling_ema, symbol, interval, windows)
+
+
+def _compute_moving_averages(kind: str, rolling, symbol: str, interval: str, windows: Iterable[int]) -> Dict:
     sym = _normalize_symbol(symbol)
     iv = _validate_interval(interval)
     history = pd.DataFrame()
     try:
-        history = _download_history(sym, iv)
+        history = _cached_history(sym, iv)
     except Exception:
         history = pd.DataFrame()
     close_series = _series_from_history(history)
     records = []
-    if close_series.empty:
+    positive = [window for window in windows if window > 0]
+    if close_series.empty or not positive:
         return {"symbol": sym, "interval": iv, "indicators": records}
-    for window in windows:
-        if window <= 0:
-            continue
-        ema_series = close_series.ewm(span=window, adjust=False).mean()
+    # Every window reads the same close array and date strings, so both are prepared once
+    dates = _history_dates(history)
+    for window, values in zip(positive, rolling(close_series, positive)):
         records.append({
-            "type": "ema",
+            "type": kind,
             "window": window,
-            "values": _series_to_list(ema_series, history)
+            "values": _values_to_points(values, dates),
         })
     return {"symbol": sym, "interval": iv, "indicators": records}
 
@@ -201,20 +613,14 @@ def compute_rsi(symbol: str, interval: str, period: int) -> Dict:
         raise ValueError("period must be positive")
     history = pd.DataFrame()
     try:
-        history = _download_history(sym, iv)
+        history = _cached_history(sym, iv)
     except Exception:
         history = pd.DataFrame()
     close_series = _series_from_history(history)
     if close_series.empty:
         values: List[Optional[float]] = []
     else:
-        delta = close_series.diff()
-        up = delta.clip(lower=0)
-        down = -delta.clip(upper=0)
-        roll_up = up.ewm(alpha=1 / period, adjust=False).mean()
-        roll_down = down.ewm(alpha=1 / period, adjust=False).mean()
-        rs = roll_up / roll_down.replace({0: np.nan})
-        rsi_series = 100 - (100 / (1 + rs))
+        rsi_series = _rolling_rsi(close_series, period)
         values = _series_to_list(rsi_series, history)
     return {
         "symbol": sym,
@@ -227,45 +633,34 @@ def compute_rsi(symbol: str, interval: str, period: int) -> Dict:
 def _series_to_list(series: pd.Series, history: pd.DataFrame) -> List[Dict[str, Optional[float]]]:
     if series.empty:
         return []
-    series = series.reset_index(drop=True)
-    history = history.reset_index()
-    values: List[Dict[str, Optional[float]]] = []
-    for idx, value in enumerate(series):
-        raw_date = history.loc[idx, "Date"] if idx < len(history) else None
-        if isinstance(raw_date, (pd.Timestamp, datetime)):
-            date_str = raw_date.tz_localize(None).strftime("%Y-%m-%d")
-        else:
-            try:
-                date_str = pd.to_datetime(raw_date).strftime("%Y-%m-%d")
-            except Exception:
-                date_str = None
-        values.append({
-            "date": date_str,
-            "value": None if value is None or (isinstance(value, float) and np.isnan(value)) else float(value),
-        })
-    return values
+    return _values_to_points(series.to_numpy(), _history_dates(history))
+
+
+def _values_to_points(values: np.ndarray, dates: List[Optional[str]]) -> List[Dict[str, Optional[float]]]:
+    # Values line up with history rows by position; rows past the end of history get no date
+    size = len(values)
+    if size == 0:
+        return []
+    dates = dates[:size] + [None] * max(0, size - len(dates))
+    return [{"date": date_str, "value": value} for date_str, value in zip(dates, _optional_floats(values))]
 
 
 def fetch_overview(symbol: str) -> Dict:
     sym = _normalize_symbol(symbol)
     info: Dict[str, Optional[str]] = {"symbol": sym}
     try:
-        ticker = yf.Ticker(sym)
-        if hasattr(ticker, "fast_info"):
-            fi = ticker.fast_info
+        if _HAS_FAST_INFO:
+            _upstream_limiter.acquire()
+            fi = _ticker(sym).fast_info
             info.update({
                 "last_price": _safe_float(getattr(fi, "last_price", None)),
                 "currency": getattr(fi, "currency", None),
                 "market_cap": _safe_float(getattr(fi, "market_cap", None)),
             })
-        try:
-            raw = ticker.info
-            if isinstance(raw, dict):
-                for key in ("longName", "shortName", "sector", "industry", "longBusinessSummary", "website"):
-                    if key in raw and raw[key]:
-                        info[key] = raw[key]
-        except Exception:
-            pass
+        raw = _cached_info(sym)
+        for key in ("longName", "shortName", "sector", "industry", "longBusinessSummary", "website"):
+            if key in raw and raw[key]:
+                info[key] = raw[key]
     except Exception:
         pass
     return info
@@ -275,15 +670,15 @@ def fetch_news(symbol: str, limit: int = MAX_NEWS_ITEMS) -> List[Dict]:
     sym = _normalize_symbol(symbol)
     items: List[Dict] = []
     try:
-        ticker = yf.Ticker(sym)
+        ticker = _ticker(sym)
         raw_news: List[Dict[str, Any]] = []
         try:
-            raw_news = ticker.news or []
+            raw_news = _upstream_call(lambda: ticker.news) or []
         except Exception:
             raw_news = []
         if not raw_news:
             try:
-                fetched = ticker.get_news()
+                fetched = _upstream_call(ticker.get_news)
                 if isinstance(fetched, list):
                     raw_news = fetched
             except Exception:
@@ -291,64 +686,13 @@ def fetch_news(symbol: str, limit: int = MAX_NEWS_ITEMS) -> List[Dict]:
         for article in raw_news[:limit]:
             if not isinstance(article, dict):
                 continue
-
-            # Handle new yfinance API structure where content is nested
-            content = article.get("content", article)
-
-            # Extract title
-            title = _safe_str(content.get("title"))
-
-            # Extract link - try clickThroughUrl first, then canonicalUrl, then fallback to old structure
-            link = None
-            click_through = content.get("clickThroughUrl")
-            canonical = content.get("canonicalUrl")
-            if isinstance(click_through, dict):
-                link = _safe_str(click_through.get("url"))
-            elif isinstance(canonical, dict):
-                link = _safe_str(canonical.get("url"))
-            else:
-                link = _safe_str(content.get("link"))
-
-            # Extract publisher
-            publisher = None
-            provider = content.get("provider")
-            if isinstance(provider, dict):
-                publisher = _safe_str(provider.get("displayName"))
-            else:
-                publisher = _safe_str(content.get("publisher"))
-
-            # Extract type
-            article_type = _safe_str(content.get("contentType") or content.get("type"))
-
-            # Extract thumbnail - check new structure first
-            thumbnail = None
-            thumb_obj = content.get("thumbnail")
-            if isinstance(thumb_obj, dict):
-                thumbnail = _safe_str(thumb_obj.get("originalUrl"))
-                if not thumbnail:
-                    resolutions = thumb_obj.get("resolutions", [])
-                    if isinstance(resolutions, list) and len(resolutions) > 0:
-                        thumbnail = _safe_str(resolutions[0].get("url"))
-            if not thumbnail:
-                thumbnail = _extract_thumbnail_url(content)
-
-            # Extract publish time - try new pubDate field first
-            pub_time = content.get("pubDate")
-            if pub_time:
-                # pubDate is already in ISO format
-                published_at = _safe_str(pub_time)
+            # Newer yfinance nests everything under "content"; each layout has its own parser so
+            # neither probes the other's keys
+            content = article.get("content")
+            if isinstance(content, dict):
+                sanitized = _parse_nested_article(content)
             else:
-                # Fallback to old providerPublishTime (Unix timestamp)
-                published_at = _timestamp_to_iso(content.get("providerPublishTime"))
-
-            sanitized = {
-                "title": title,
-                "link": link,
-                "publisher": publisher,
-                "type": article_type,
-                "thumbnail": thumbnail,
-                "published_at": published_at,
-            }
+                sanitized = _parse_legacy_article(article)
             if not (sanitized["title"] or sanitized["link"]):
                 continue
             items.append(sanitized)
@@ -357,63 +701,166 @@ def fetch_news(symbol: str, limit: int = MAX_NEWS_ITEMS) -> List[Dict]:
     return items
 
 
+def _parse_nested_article(content: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    # Fallback keys are only probed when the nested field is missing
+    for key in ("clickThroughUrl", "canonicalUrl"):
+        target = content.get(key)
+        if isinstance(target, dict):
+            link = _safe_str(target.get("url"))
+            break
+    else:
+        link = _safe_str(content.get("link"))
+    provider = content.get("provider")
+    thumb_obj = content.get("thumbnail")
+    thumbnail = _safe_str(thumb_obj.get("originalUrl")) if isinstance(thumb_obj, dict) else None
+    pub_date = content.get("pubDate")
+    return {
+        "title": _safe_str(content.get("title")),
+        "link": link,
+        "publisher": _safe_str(provider.get("displayName") if isinstance(provider, dict) else content.get("publisher")),
+        "type": _safe_str(content.get("contentType") or content.get("type")),
+        "thumbnail": thumbnail or _extract_thumbnail_url(content),
+        # pubDate is already ISO 8601
+        "published_at": _safe_str(pub_date) if pub_date else _timestamp_to_iso(content.get("providerPublishTime")),
+    }
+
+
+def _parse_legacy_article(article: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    return {
+        "title": _safe_str(article.get("title")),
+        "link": _safe_str(article.get("link")),
+        "publisher": _safe_str(article.get("publisher")),
+        "type": _safe_str(article.get("type")),
+        "thumbnail": _extract_thumbnail_url(article),
+        # Unix timestamp in the old layout
+        "published_at": _timestamp_to_iso(article.get("providerPublishTime")),
+    }
+
+
 def get_current_prices(symbols: Iterable[str]) -> Dict[str, Optional[float]]:
     """
     Fetch current prices for a list of stock symbols in a single batch call when possible.
 
     Returns mapping of uppercased symbol -> last price (float) or None if unavailable.
     """
-    symbol_list = [s.strip().upper() for s in symbols if s and s.strip()]
+    symbol_list = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
     if not symbol_list:
         return {}
 
     prices: Dict[str, Optional[float]] = {s: None for s in symbol_list}
+    # One quote request covers QUOTE_BATCH_SIZE symbols; per-symbol lookups only fill the gaps
+    prices.update(_quote_prices(symbol_list))
+    pending = [sym for sym in symbol_list if prices[sym] is None]
+    if pending:
+        prices.update(_fast_info_prices(pending))
+    # Symbols without a fast_info quote share one batched 1m download instead of one history call each
+    missing = [sym for sym in symbol_list if prices[sym] is None]
+    if missing:
+        prices.update(_latest_closes(missing))
+    return prices
+
+
+def _map_concurrently(fetch, items: List[Any]) -> List[Any]:
+    if len(items) == 1:
+        return [fetch(items[0])]
+    # Each call is a blocking HTTP round trip, so overlap them instead of pacing them
+    with ThreadPoolExecutor(max_workers=min(PRICE_LOOKUP_WORKERS, len(items))) as executor:
+        return list(executor.map(fetch, items))
+
 
+def _quote_prices(symbols: List[str]) -> Dict[str, float]:
+    if YfData is None:
+        return {}
+
+    def _fetch(chunk: List[str]) -> Dict[str, float]:
+        try:
+            params = {"symbols": ",".join(chunk), "formatted": "false"}
+            payload = _upstream_call(lambda: YfData().get_raw_json(QUOTE_URL, params=params))
+            results = payload["quoteResponse"]["result"] or []
+        except Exception:
+            return {}
+        found: Dict[str, float] = {}
+        for quote in results:
+            if not isinstance(quote, dict):
+                continue
+            sym = str(quote.get("symbol") or "").upper()
+            price = _safe_float(quote.get("regularMarketPrice"))
+            if sym and price is not None:
+                found[sym] = price
+        return found
+
+    chunks = [symbols[i : i + QUOTE_BATCH_SIZE] for i in range(0, len(symbols), QUOTE_BATCH_SIZE)]
+    prices: Dict[str, float] = {}
+    for found in _map_concurrently(_fetch, chunks):
+        prices.update(found)
+    return prices
+
+
+def _fast_info_prices(symbol_list: List[str]) -> Dict[str, Optional[float]]:
     try:
         # yfinance Tickers supports batch fetching
-        tickers = yf.Tickers(" ".join(symbol_list))
-        # Try fast price field via ticker.info-like behavior using .fast_info or .info fallbacks
-        # We will attempt to use .fast_info.last_price which is typically available
-        for sym in symbol_list:
-            try:
-                t = tickers.tickers.get(sym)
-                if t is None:
-                    continue
-                # Prefer fast_info if available
-                last_price = None
-                if hasattr(t, "fast_info") and getattr(t.fast_info, "last_price", None) is not None:
-                    last_price = float(t.fast_info.last_price)
-                else:
-                    # Fallback to history recent close/price
-                    hist = t.history(period="1d", interval="1m")
-                    if not hist.empty:
-                        last_price = float(hist["Close"].iloc[-1])
-                prices[sym] = last_price
-                # Tiny delay to be gentle when many symbols
-                time.sleep(0.02)
-            except Exception:
-                # On per-symbol failure, keep None
-                prices[sym] = None
-                continue
+        tickers: Optional[Dict[str, Any]] = yf.Tickers(" ".join(symbol_list)).tickers
     except Exception:
-        # Fallback: try symbol-by-symbol if batch failed entirely
-        for sym in symbol_list:
-            try:
-                t = yf.Ticker(sym)
-                last_price = None
-                if hasattr(t, "fast_info") and getattr(t.fast_info, "last_price", None) is not None:
-                    last_price = float(t.fast_info.last_price)
-                else:
-                    hist = t.history(period="1d", interval="1m")
-                    if not hist.empty:
-                        last_price = float(hist["Close"].iloc[-1])
-                prices[sym] = last_price
-                time.sleep(0.05)
-            except Exception:
-                prices[sym] = None
-                continue
+        # Fallback: build tickers symbol-by-symbol if the batch failed entirely
+        tickers = None
 
-    return prices
+    def _lookup(sym: str) -> Optional[float]:
+        try:
+            if tickers is None:
+                ticker = yf.Ticker(sym)
+            else:
+                ticker = tickers.get(sym)
+                if ticker is None:
+                    return None
+            return _upstream_call(lambda: _fast_info_price(ticker))
+        except Exception:
+            # On per-symbol failure, keep None
+            return None
+
+    return dict(zip(symbol_list, _map_concurrently(_lookup, symbol_list)))
+
+
+def _fast_info_price(ticker: Any) -> Optional[float]:
+    # One attribute walk; a missing fast_info or an unset price both land in the except
+    try:
+        return float(ticker.fast_info.last_price)
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+
+def _latest_closes(symbols: List[str]) -> Dict[str, float]:
+    try:
+        frame = _upstream_call(
+            lambda: yf.download(
+                symbols,
+                period="1d",
+                interval="1m",
+                group_by="ticker",
+                threads=True,
+                progress=False,
+                auto_adjust=False,
+            )
+        )
+    except Exception:
+        return {}
+    if frame is None or frame.empty:
+        return {}
+    closes: Dict[str, float] = {}
+    grouped = isinstance(frame.columns, pd.MultiIndex)
+    for sym in symbols:
+        try:
+            if grouped:
+                column = frame[sym]["Close"]
+            elif len(symbols) == 1:
+                column = frame["Close"]
+            else:
+                continue
+            column = column.dropna()
+            if len(column):
+                closes[sym] = float(column.iloc[-1])
+        except Exception:
+            continue
+    return closes
 
 
 def calculate_percent_change(initial_price: Optional[float], current_price: Optional[float]) -> Optional[float]:
@@ -425,31 +872,45 @@ def calculate_percent_change(initial_price: Optional[float], current_price: Opti
         return None
 
 
+def calculate_percent_changes(
+    initial_prices: Iterable[Optional[float]],
+    current_prices: Iterable[Optional[float]],
+) -> List[Optional[float]]:
+    """Vectorized calculate_percent_change over aligned sequences; None where undefined."""
+    initials_list = list(initial_prices)
+    currents_list = list(current_prices)
+    try:
+        initials = np.array(initials_list, dtype=np.float64)
+        currents = np.array(currents_list, dtype=np.float64)
+    except (TypeError, ValueError):
+        return [calculate_percent_change(i, c) for i, c in zip(initials_list, currents_list)]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = (currents - initials) / initials * 100.0
+    valid = (initials != 0) & (currents != 0) & np.isfinite(pct)
+    return [value if ok else None for value, ok in zip(pct.tolist(), valid.tolist())]
+
+
 def get_stock_info(symbol: str) -> Dict:
     """Optional: detailed info for a single symbol for future enhancements."""
     sym = (symbol or "").strip().upper()
     if not sym:
         return {}
     try:
-        t = yf.Ticker(sym)
         info = {}
         # Prefer fast_info basic fields
-        if hasattr(t, "fast_info"):
-            fi = t.fast_info
+        if _HAS_FAST_INFO:
+            _upstream_limiter.acquire()
+            fi = _ticker(sym).fast_info
             info.update({
                 "last_price": getattr(fi, "last_price", None),
                 "market_cap": getattr(fi, "market_cap", None),
                 "previous_close": getattr(fi, "previous_close", None),
             })
-        # Try to enrich via .info (can be slower)
-        try:
-            raw = t.info
-            if isinstance(raw, dict):
-                for key in ("longName", "shortName", "currency", "exchange"):
-                    if key in raw:
-                        info[key] = raw[key]
-        except Exception:
-            pass
+        # Enrich via the shared .info cache (the scrape itself is slow)
+        raw = _cached_info(sym)
+        for key in ("longName", "shortName", "currency", "exchange"):
+            if key in raw:
+                info[key] = raw[key]
         return info
     except Exception:
         return {}
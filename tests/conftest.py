@@ -0,0 +1,93 @@
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import orjson
+import pytest
+from werkzeug.test import EnvironBuilder
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Keep the import-time index load (and the history store beside it) out of the repo's data/
+os.environ.setdefault("STOCKS_PATH", tempfile.mkdtemp(prefix="ablist-tests-"))
+
+import app as app_module
+from app import app
+
+app.config.update(TESTING=True, PROPAGATE_EXCEPTIONS=True)
+
+# Built once for the session; each test only rebinds return_value / side_effect
+UPSTREAM_FAKES = {
+    name: MagicMock(name=name)
+    for name in ("fetch_price_history", "compute_sma", "compute_rsi", "fetch_news", "fetch_overview")
+}
+
+
+@pytest.fixture(autouse=True)
+def data_root(tmp_path, monkeypatch):
+    """Give every test its own empty store so no test reads or writes another's files."""
+    monkeypatch.setattr(app_module, "DATA_ROOT", str(tmp_path))
+    monkeypatch.setattr(app_module, "INDEX_FILE", str(tmp_path / "index.json"))
+    monkeypatch.setattr(app_module, "_records", {})
+    monkeypatch.setattr(app_module, "_index_state", app_module._default_index())
+    monkeypatch.setattr(app_module, "_response_cache", {})
+    yield tmp_path
+    # Flush while the paths still point here; otherwise the debounced flusher could write this
+    # test's index over the restored INDEX_FILE
+    app_module._flush_index()
+
+
+@pytest.fixture(scope="session")
+def client():
+    # The test client keeps no per-test state, so one instance serves the whole run
+    with app.test_client() as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def loads():
+    # Parse response.data directly instead of going through get_json()'s mimetype checks
+    return orjson.loads
+
+
+@pytest.fixture(scope="session")
+def wsgi_get():
+    """GET a path straight through app.wsgi_app and return (status code, body).
+
+    The environ for each path is built once and copied per call, which skips the
+    test client's request building and response wrapping for status-only probes.
+    """
+    environs = {}
+
+    def get(path):
+        environ = environs.get(path)
+        if environ is None:
+            environ = environs[path] = EnvironBuilder(path=path, method="GET").get_environ()
+        status = []
+        body = app.wsgi_app(dict(environ), lambda line, headers, exc_info=None: status.append(line))
+        try:
+            data = b"".join(body)
+        finally:
+            if hasattr(body, "close"):
+                body.close()
+        return int(status[0].split(" ", 1)[0]), data
+
+    return get
+
+
+@pytest.fixture()
+def upstream():
+    """Swap the app's upstream helpers for the shared doubles in UPSTREAM_FAKES."""
+    originals = {name: getattr(app_module, name) for name in UPSTREAM_FAKES}
+    for name, fake in UPSTREAM_FAKES.items():
+        fake.reset_mock(return_value=True, side_effect=True)
+        setattr(app_module, name, fake)
+    try:
+        yield SimpleNamespace(**UPSTREAM_FAKES)
+    finally:
+        for name, original in originals.items():
+            setattr(app_module, name, original)
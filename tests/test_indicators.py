@@ -0,0 +1,150 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import stock_api
+
+
+@pytest.fixture()
+def closes():
+    rng = np.random.default_rng(7)
+    values = 100 + np.cumsum(rng.normal(0, 1, 300))
+    values[[0, 40, 41, 200]] = np.nan
+    return pd.Series(values)
+
+
+@pytest.mark.parametrize("window", [1, 5, 20])
+def test_sma_kernel_matches_pandas(closes, window):
+    expected = closes.rolling(window=window, min_periods=1).mean().to_numpy()
+    actual = stock_api._sma_kernel(closes.to_numpy(dtype=np.float64), window)
+    np.testing.assert_allclose(actual, expected, equal_nan=True)
+
+
+@pytest.mark.parametrize("window", [1, 12, 26])
+def test_ema_kernel_matches_pandas(closes, window):
+    expected = closes.ewm(span=window, adjust=False).mean().to_numpy()
+    actual = stock_api._ewm_kernel(closes.to_numpy(dtype=np.float64), 2.0 / (window + 1.0))
+    np.testing.assert_allclose(actual, expected, equal_nan=True)
+
+
+@pytest.mark.parametrize("period", [2, 14])
+def test_rsi_kernel_matches_pandas(closes, period):
+    delta = closes.diff()
+    roll_up = delta.clip(lower=0).ewm(alpha=1 / period, adjust=False).mean()
+    roll_down = (-delta.clip(upper=0)).ewm(alpha=1 / period, adjust=False).mean()
+    expected = (100 - (100 / (1 + roll_up / roll_down.replace({0: np.nan})))).to_numpy()
+    actual = stock_api._rsi_kernel(closes.to_numpy(dtype=np.float64), period)
+    np.testing.assert_allclose(actual, expected, equal_nan=True)
+
+
+def test_percent_changes_match_scalar_version():
+    initials = [100.0, None, 0, 50.0, 20.0, 10.0]
+    currents = [150.0, 10.0, 10.0, None, 30.0, 0]
+    expected = [stock_api.calculate_percent_change(i, c) for i, c in zip(initials, currents)]
+    assert stock_api.calculate_percent_changes(initials, currents) == pytest.approx(expected)
+
+
+def test_history_to_records_formats_columns():
+    index = pd.DatetimeIndex(["2024-01-02", "2024-01-03"], name="Date").tz_localize("America/New_York")
+    history = pd.DataFrame({"Open": [1.0, np.nan], "Close": [1.5, 2.5], "Volume": [100, 200]}, index=index)
+
+    records = stock_api._history_to_records(history)
+    assert records[0] == {
+        "date": "2024-01-02",
+        "open": 1.0,
+        "high": None,
+        "low": None,
+        "close": 1.5,
+        "adj_close": None,
+        "volume": 100.0,
+    }
+    assert records[1]["open"] is None
+    assert stock_api._series_to_list(pd.Series([np.nan, 2.0, 3.0]), history) == [
+        {"date": "2024-01-02", "value": None},
+        {"date": "2024-01-03", "value": 2.0},
+        {"date": None, "value": 3.0},
+    ]
+
+
+def test_indicator_endpoints_share_one_history_download(monkeypatch):
+    calls = []
+    index = pd.DatetimeIndex(["2024-01-02", "2024-01-03", "2024-01-04"], name="Date")
+    history = pd.DataFrame({"Close": [1.0, 2.0, 3.0]}, index=index)
+
+    def fake_download(symbol, interval):
+        calls.append((symbol, interval))
+        return history
+
+    monkeypatch.setattr(stock_api, "_history_cache", {})
+    monkeypatch.setattr(stock_api, "HISTORY_STORE_DIR", None)
+    monkeypatch.setattr(stock_api, "_download_history", fake_download)
+    stock_api.compute_sma("AAPL", "1d", [2])
+    stock_api.compute_rsi("AAPL", "1d", 2)
+    assert len(stock_api.fetch_price_history("AAPL", "1d")["points"]) == 3
+    assert calls == [("AAPL", "1d")]
+
+
+def test_multi_window_kernels_match_single_window(closes):
+    values = closes.to_numpy(dtype=np.float64)
+    windows = np.asarray([1, 5, 20], dtype=np.int64)
+    sma = stock_api._sma_many_kernel(values, windows)
+    ema = stock_api._ewm_many_kernel(values, 2.0 / (windows.astype(np.float64) + 1.0))
+    for row, window in enumerate(windows):
+        np.testing.assert_allclose(sma[row], stock_api._sma_kernel(values, int(window)), equal_nan=True)
+        np.testing.assert_allclose(
+            ema[row], closes.ewm(span=int(window), adjust=False).mean().to_numpy(), equal_nan=True
+        )
+
+
+def test_compute_sma_reports_each_positive_window(monkeypatch):
+    index = pd.DatetimeIndex(["2024-01-02", "2024-01-03", "2024-01-04"], name="Date")
+    history = pd.DataFrame({"Close": [1.0, 2.0, 3.0]}, index=index)
+    monkeypatch.setattr(stock_api, "_cached_history", lambda symbol, interval: history)
+
+    data = stock_api.compute_sma("aapl", "1d", [2, 0, 3])
+    assert [item["window"] for item in data["indicators"]] == [2, 3]
+    assert [point["value"] for point in data["indicators"][0]["values"]] == [1.0, 1.5, 2.5]
+    assert data["indicators"][1]["values"][-1] == {"date": "2024-01-04", "value": 2.0}
+
+
+@pytest.mark.parametrize("period", [2, 14])
+def test_rolling_rsi_fallback_matches_pandas(closes, period, monkeypatch):
+    delta = closes.diff()
+    roll_up = delta.clip(lower=0).ewm(alpha=1 / period, adjust=False).mean()
+    roll_down = (-delta.clip(upper=0)).ewm(alpha=1 / period, adjust=False).mean()
+    expected = (100 - (100 / (1 + roll_up / roll_down.replace({0: np.nan})))).to_numpy()
+    monkeypatch.setattr(stock_api, "njit", None)
+    np.testing.assert_allclose(stock_api._rolling_rsi(closes, period).to_numpy(), expected, equal_nan=True)
+
+
+def test_compiled_kernels_match_pandas_path(closes):
+    numba = pytest.importorskip("numba")
+    for kernel in (stock_api._sma_kernel, stock_api._ewm_kernel, stock_api._rsi_kernel):
+        assert isinstance(kernel, numba.core.registry.CPUDispatcher)
+    windows = [5, 20, 50]
+    sma = stock_api._rolling_sma(closes, windows)
+    ema = stock_api._rolling_ema(closes, windows)
+    for row, window in enumerate(windows):
+        expected_sma = closes.rolling(window=window, min_periods=1).mean().to_numpy()
+        expected_ema = closes.ewm(span=window, adjust=False).mean().to_numpy()
+        np.testing.assert_allclose(sma[row], expected_sma, equal_nan=True)
+        np.testing.assert_allclose(ema[row], expected_ema, equal_nan=True)
+
+
+def test_columnar_history_matches_records(monkeypatch):
+    index = pd.DatetimeIndex(["2024-01-02", "2024-01-03"], name="Date")
+    history = pd.DataFrame({"Close": [1.5, np.nan], "Volume": [100, 200]}, index=index)
+    monkeypatch.setattr(stock_api, "_cached_history", lambda symbol, interval: history)
+
+    columns = stock_api.fetch_price_history("aapl", "1d", columnar=True)["columns"]
+    points = stock_api.fetch_price_history("aapl", "1d")["points"]
+    assert columns["date"] == ["2024-01-02", "2024-01-03"]
+    assert columns["close"] == [1.5, None]
+    assert [dict(zip(columns, row)) for row in zip(*columns.values())] == points
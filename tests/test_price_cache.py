@@ -0,0 +1,165 @@
+import os
+import sys
+import threading
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import app as app_module
+from app import PriceCache, SingleFlightCache
+
+
+def test_get_many_returns_primed_prices():
+    cache = PriceCache(ttl_seconds=60)
+    cache.prime("aapl", 150.0)
+    cache.prime("MSFT", None)
+
+    prices = cache.get_many([" aapl ", "MSFT", "AAPL"], schedule_refresh=False)
+    assert prices == {"AAPL": 150.0, "MSFT": None}
+    assert cache.get_many(["AAPL", "AAPL"], normalized=True) == {"AAPL": 150.0}
+
+
+def test_get_many_schedules_stale_symbols(monkeypatch):
+    cache = PriceCache(ttl_seconds=60)
+    monkeypatch.setattr(cache, "_ensure_worker_locked", lambda: None)
+    cache.prime("AAPL", 150.0)
+
+    assert cache.get_many(["AAPL", "TSLA"]) == {"AAPL": 150.0}
+    assert cache._pending == {"TSLA"}
+
+
+def test_fetch_batch_splits_into_chunks(monkeypatch):
+    calls = []
+
+    def fake_prices(symbols):
+        calls.append(list(symbols))
+        if "BAD" in symbols:
+            raise RuntimeError("upstream failure")
+        return {sym: 1.0 for sym in symbols}
+
+    monkeypatch.setattr(app_module, "PRICE_BATCH_SIZE", 2)
+    monkeypatch.setattr(app_module, "get_current_prices", fake_prices)
+    cache = PriceCache(ttl_seconds=60)
+
+    prices, failed = cache._fetch_batch(["A", "B", "C", "BAD", "E"])
+    assert sorted(len(chunk) for chunk in calls) == [1, 2, 2]
+    assert prices == {"A": 1.0, "B": 1.0, "E": 1.0}
+    assert failed == ["C", "BAD"]
+
+
+def test_get_many_ordered_aligns_with_input(monkeypatch):
+    cache = PriceCache(ttl_seconds=60)
+    monkeypatch.setattr(cache, "_ensure_worker_locked", lambda: None)
+    cache.prime("MSFT", 300.0)
+    cache.prime("AAPL", 150.0)
+
+    assert cache.get_many_ordered(["AAPL", "TSLA", "MSFT"]) == [150.0, None, 300.0]
+    assert cache._pending == {"TSLA"}
+
+
+def test_single_flight_cache_coalesces_concurrent_misses():
+    cache = SingleFlightCache()
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        release.wait(timeout=5)
+        return {"points": [1]}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_load(("history", "AAPL"), 60, loader)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert calls == [1]
+    assert results == [{"points": [1]}] * 4
+    assert cache.get_or_load(("history", "AAPL"), 60, loader) == {"points": [1]}
+    assert calls == [1]
+
+
+def test_single_flight_cache_skips_uncacheable_values():
+    cache = SingleFlightCache()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return []
+
+    assert cache.get_or_load(("news", "AAPL", 10), 60, loader) == []
+    assert cache.get_or_load(("news", "AAPL", 10), 60, loader) == []
+    assert len(calls) == 2
+
+
+def test_worker_refreshes_scheduled_symbols(monkeypatch):
+    fetched = threading.Event()
+
+    def fake_prices(symbols):
+        fetched.set()
+        return {sym: 42.0 for sym in symbols}
+
+    monkeypatch.setattr(app_module, "get_current_prices", fake_prices)
+    cache = PriceCache(ttl_seconds=60)
+    try:
+        assert cache.get_many(["NVDA"]) == {}
+        assert fetched.wait(timeout=5)
+        for _ in range(100):
+            if cache.get_many(["NVDA"], schedule_refresh=False):
+                break
+            threading.Event().wait(0.01)
+        assert cache.get_many(["NVDA"], schedule_refresh=False) == {"NVDA": 42.0}
+    finally:
+        cache.stop()
+    assert not cache._worker.is_alive()
+
+
+def test_worker_keeps_tracked_symbols_warm(monkeypatch):
+    fetched = threading.Event()
+    batches = []
+
+    def fake_prices(symbols):
+        batches.append(sorted(symbols))
+        fetched.set()
+        return {sym: 1.0 for sym in symbols}
+
+    monkeypatch.setattr(app_module, "get_current_prices", fake_prices)
+    cache = PriceCache(ttl_seconds=60, warm_symbols=lambda: ["AMD", "NVDA"], warm_interval=0.01)
+    cache.prime("AMD", 2.0)
+    try:
+        with cache._lock:
+            cache._ensure_worker_locked()
+        assert fetched.wait(timeout=5)
+    finally:
+        cache.stop()
+    assert batches[0] == ["NVDA"]
+
+
+def test_warm_pass_runs_while_requests_keep_waking_the_worker(monkeypatch):
+    batches = []
+    warmed = threading.Event()
+
+    def fake_prices(symbols):
+        batches.append(sorted(symbols))
+        if "AMD" in symbols:
+            warmed.set()
+        return {sym: 1.0 for sym in symbols}
+
+    monkeypatch.setattr(app_module, "get_current_prices", fake_prices)
+    cache = PriceCache(ttl_seconds=60, warm_symbols=lambda: ["AMD"], warm_interval=0.2)
+    try:
+        # A fresh symbol every few milliseconds wakes the worker long before the interval times out
+        for n in range(200):
+            cache._schedule([f"T{n}"])
+            if warmed.wait(timeout=0.005):
+                break
+        assert warmed.is_set()
+    finally:
+        cache.stop()
+    assert any("AMD" in batch for batch in batches)
@@ -0,0 +1,310 @@
+import os
+import sys
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import stock_api
+
+
+def test_get_current_prices_looks_up_each_symbol(monkeypatch):
+    class FakeInfo:
+        def __init__(self, price):
+            self.last_price = price
+
+    class FakeTicker:
+        def __init__(self, price):
+            self.fast_info = FakeInfo(price)
+
+    class FakeTickers:
+        def __init__(self, joined):
+            self.tickers = {sym: FakeTicker(float(len(sym))) for sym in joined.split()}
+            self.tickers["BAD"].fast_info = None
+
+    downloads = []
+
+    def fake_download(symbols, **kwargs):
+        downloads.append(list(symbols))
+        columns = pd.MultiIndex.from_product([symbols, ["Close"]])
+        return pd.DataFrame([[7.0], [np.nan]], columns=columns)
+
+    monkeypatch.setattr(stock_api, "_quote_prices", lambda symbols: {})
+    monkeypatch.setattr(stock_api.yf, "Tickers", FakeTickers)
+    monkeypatch.setattr(stock_api.yf, "download", fake_download)
+    prices = stock_api.get_current_prices(["aapl", "MSFT", "bad", "AAPL"])
+    assert prices == {"AAPL": 4.0, "MSFT": 4.0, "BAD": 7.0}
+    assert downloads == [["BAD"]]
+
+
+def test_get_current_prices_batches_quote_requests(monkeypatch):
+    requests = []
+
+    class FakeYfData:
+        def get_raw_json(self, url, params=None):
+            symbols = params["symbols"].split(",")
+            requests.append(symbols)
+            quotes = [{"symbol": sym, "regularMarketPrice": 1.0} for sym in symbols if sym != "S3"]
+            return {"quoteResponse": {"result": quotes}}
+
+    fast_info_lookups = []
+    monkeypatch.setattr(stock_api, "YfData", FakeYfData)
+    monkeypatch.setattr(stock_api, "QUOTE_BATCH_SIZE", 2)
+    monkeypatch.setattr(stock_api, "_fast_info_prices", lambda symbols: fast_info_lookups.append(symbols) or {})
+    monkeypatch.setattr(stock_api, "_latest_closes", lambda symbols: {})
+
+    prices = stock_api.get_current_prices([f"s{i}" for i in range(5)])
+    assert sorted(requests) == [["S0", "S1"], ["S2", "S3"], ["S4"]]
+    assert prices == {"S0": 1.0, "S1": 1.0, "S2": 1.0, "S3": None, "S4": 1.0}
+    assert fast_info_lookups == [["S3"]]
+
+
+def test_overview_and_info_share_one_info_scrape(monkeypatch):
+    scrapes = []
+
+    class FakeTicker:
+        fast_info = None
+
+        def __init__(self, symbol):
+            self.symbol = symbol
+
+        @property
+        def info(self):
+            scrapes.append(self.symbol)
+            return {"longName": "Apple Inc.", "currency": "USD"}
+
+    monkeypatch.setattr(stock_api, "_info_cache", {})
+    monkeypatch.setattr(stock_api, "_quote_summary", lambda symbol: {})
+    monkeypatch.setattr(stock_api, "_ticker_cache", {})
+    monkeypatch.setattr(stock_api.yf, "Ticker", FakeTicker)
+    assert stock_api.fetch_overview("aapl")["longName"] == "Apple Inc."
+    assert stock_api.get_stock_info("AAPL")["currency"] == "USD"
+    assert scrapes == ["AAPL"]
+
+
+def test_overview_reads_selected_quote_summary_modules(monkeypatch):
+    requests = []
+
+    class FakeYfData:
+        def get_raw_json(self, url, params=None):
+            requests.append((url.rsplit("/", 1)[-1], params["modules"]))
+            return {
+                "quoteSummary": {
+                    "result": [
+                        {
+                            "assetProfile": {"sector": "Technology", "website": "https://apple.com"},
+                            "price": {"longName": "Apple Inc.", "currency": "USD"},
+                        }
+                    ]
+                }
+            }
+
+    class NoInfoTicker:
+        fast_info = None
+
+        def __init__(self, symbol):
+            pass
+
+        @property
+        def info(self):
+            raise AssertionError("full .info scrape should not run")
+
+    monkeypatch.setattr(stock_api, "_info_cache", {})
+    monkeypatch.setattr(stock_api, "YfData", FakeYfData)
+    monkeypatch.setattr(stock_api, "_ticker_cache", {})
+    monkeypatch.setattr(stock_api.yf, "Ticker", NoInfoTicker)
+    overview = stock_api.fetch_overview("AAPL")
+    assert overview["longName"] == "Apple Inc."
+    assert overview["sector"] == "Technology"
+    assert requests == [("AAPL", stock_api.QUOTE_SUMMARY_MODULES)]
+
+
+def test_token_bucket_blocks_only_past_the_burst():
+    now = [0.0]
+    slept = []
+    bucket = stock_api._TokenBucket(rate=2.0, capacity=2, clock=lambda: now[0], sleep=slept.append)
+
+    assert [bucket.acquire(), bucket.acquire()] == [0.0, 0.0]
+    assert bucket.acquire() == pytest.approx(0.5)
+    assert bucket.acquire() == pytest.approx(1.0)
+    now[0] = 5.0
+    assert bucket.acquire() == 0.0
+    assert slept == pytest.approx([0.5, 1.0])
+
+
+def test_upstream_call_retries_only_transient_errors(monkeypatch):
+    monkeypatch.setattr(stock_api, "UPSTREAM_RETRY_BASE_SECONDS", 0.0)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("reset by peer")
+        return "ok"
+
+    assert stock_api._upstream_call(flaky) == "ok"
+    assert len(attempts) == 3
+
+    def broken():
+        attempts.append(1)
+        raise ValueError("bad symbol")
+
+    attempts.clear()
+    with pytest.raises(ValueError):
+        stock_api._upstream_call(broken)
+    assert len(attempts) == 1
+
+
+def test_download_history_requests_bounded_window(monkeypatch):
+    calls = []
+
+    class FakeTicker:
+        def __init__(self, symbol):
+            pass
+
+        def history(self, **kwargs):
+            calls.append(kwargs)
+            return pd.DataFrame()
+
+    monkeypatch.setattr(stock_api, "_ticker_cache", {})
+    monkeypatch.setattr(stock_api.yf, "Ticker", FakeTicker)
+    stock_api._download_history("AAPL", "1d")
+    stock_api._download_history("AAPL", "1wk")
+    daily, weekly = (date.fromisoformat(call["start"]) for call in calls)
+    assert (daily - weekly).days == 7
+    assert all("period" not in call for call in calls)
+    assert stock_api._history_start("1d", date(2024, 3, 1)) == "2020-03-01"
+
+
+def test_ticker_objects_are_reused_briefly(monkeypatch):
+    monkeypatch.setattr(stock_api, "_ticker_cache", {})
+    monkeypatch.setattr(stock_api.yf, "Ticker", lambda symbol: object())
+    first = stock_api._ticker("AAPL")
+    assert stock_api._ticker("AAPL") is first
+    assert stock_api._ticker("MSFT") is not first
+
+    monkeypatch.setattr(stock_api, "TICKER_REUSE_SECONDS", 0.0)
+    assert stock_api._ticker("AAPL") is not first
+
+
+def test_stored_history_is_topped_up_incrementally(tmp_path, monkeypatch):
+    today = pd.Timestamp.utcnow().normalize().tz_localize(None)
+    days = [today - pd.Timedelta(days=n) for n in (2, 1, 0)]
+    first = pd.DataFrame({"Close": [1.0, 2.0]}, index=pd.DatetimeIndex(days[:2]))
+    top_up = pd.DataFrame({"Close": [2.5, 3.0]}, index=pd.DatetimeIndex(days[1:]))
+    calls = []
+
+    def fake_download(symbol, interval, start=None):
+        calls.append(start)
+        return first if start is None else top_up
+
+    monkeypatch.setattr(stock_api, "HISTORY_STORE_DIR", str(tmp_path))
+    monkeypatch.setattr(stock_api, "_download_history", fake_download)
+    assert stock_api._load_history("BRK.B", "1d")["Close"].tolist() == [1.0, 2.0]
+    assert stock_api._load_history("BRK.B", "1d")["Close"].tolist() == [1.0, 2.5, 3.0]
+    assert calls == [None, days[1].date().isoformat()]
+    stored = stock_api._read_stored_history(stock_api._history_store_path("BRK.B", "1d"))
+    assert stored["Close"].tolist() == [1.0, 2.5, 3.0]
+
+
+def test_failed_top_up_serves_the_stored_history(tmp_path, monkeypatch):
+    today = pd.Timestamp.utcnow().normalize().tz_localize(None)
+    bars = pd.DataFrame({"Close": [1.0, 2.0]}, index=pd.DatetimeIndex([today - pd.Timedelta(days=1), today]))
+
+    def fake_download(symbol, interval, start=None):
+        if start is not None:
+            raise ConnectionError("upstream unavailable")
+        return bars
+
+    monkeypatch.setattr(stock_api, "HISTORY_STORE_DIR", str(tmp_path))
+    monkeypatch.setattr(stock_api, "_download_history", fake_download)
+    stock_api._load_history("AAPL", "1d")
+    assert stock_api._load_history("AAPL", "1d")["Close"].tolist() == [1.0, 2.0]
+
+
+def test_stale_history_store_is_downloaded_again_in_full(tmp_path, monkeypatch):
+    today = pd.Timestamp.utcnow().normalize().tz_localize(None)
+    bars = pd.DataFrame({"Close": [1.0, 2.0]}, index=pd.DatetimeIndex([today - pd.Timedelta(days=1), today]))
+    calls = []
+
+    def fake_download(symbol, interval, start=None):
+        calls.append(start)
+        return bars
+
+    monkeypatch.setattr(stock_api, "HISTORY_STORE_DIR", str(tmp_path))
+    monkeypatch.setattr(stock_api, "_download_history", fake_download)
+    stock_api._load_history("AAPL", "1d")
+    path = stock_api._history_store_path("AAPL", "1d")
+    fetched_at = os.path.getmtime(path)
+
+    stock_api._load_history("AAPL", "1d")
+    assert calls[-1] is not None
+    assert os.path.getmtime(path) == fetched_at
+
+    monkeypatch.setattr(stock_api, "HISTORY_STORE_MAX_AGE_SECONDS", 0)
+    stock_api._load_history("AAPL", "1d")
+    assert calls[-1] is None
+
+
+def test_stored_history_is_plain_csv_and_keeps_the_exchange_timezone(tmp_path, monkeypatch):
+    tz = "America/New_York"
+    days = pd.date_range(end=pd.Timestamp.now(tz=tz).normalize(), periods=3, freq="D", name="Date")
+    first = pd.DataFrame({"Close": [1.0, 2.0], "Volume": [10, 20]}, index=days[:2])
+    top_up = pd.DataFrame({"Close": [2.5, 3.0], "Volume": [25, 30]}, index=days[1:])
+    monkeypatch.setattr(stock_api, "HISTORY_STORE_DIR", str(tmp_path))
+    monkeypatch.setattr(stock_api, "_download_history", lambda s, i, start=None: first if start is None else top_up)
+
+    stock_api._load_history("AAPL", "1d")
+    path = stock_api._history_store_path("AAPL", "1d")
+    assert path.endswith(".csv")
+    with open(path) as fh:
+        assert fh.readline().startswith("Date,Close,Volume")
+
+    history = stock_api._load_history("AAPL", "1d")
+    assert str(history.index.tz) == tz
+    assert list(history.index) == list(days)
+    assert history["Close"].tolist() == [1.0, 2.5, 3.0]
+
+
+def test_fetch_news_parses_both_article_layouts(monkeypatch):
+    nested = {
+        "content": {
+            "title": "Nested",
+            "clickThroughUrl": None,
+            "canonicalUrl": {"url": "https://example.com/a"},
+            "provider": {"displayName": "Wire"},
+            "contentType": "STORY",
+            "thumbnail": {"originalUrl": None, "resolutions": [{"url": "https://example.com/t.jpg"}]},
+            "pubDate": "2024-01-02T10:00:00Z",
+        }
+    }
+    legacy = {"title": "Legacy", "link": "https://example.com/b", "publisher": "Desk", "type": "STORY"}
+
+    class FakeTicker:
+        news = [nested, legacy, {"content": {}}]
+
+    monkeypatch.setattr(stock_api, "_ticker", lambda symbol: FakeTicker())
+    articles = stock_api.fetch_news("aapl")
+    assert articles == [
+        {
+            "title": "Nested",
+            "link": "https://example.com/a",
+            "publisher": "Wire",
+            "type": "STORY",
+            "thumbnail": "https://example.com/t.jpg",
+            "published_at": "2024-01-02T10:00:00Z",
+        },
+        {
+            "title": "Legacy",
+            "link": "https://example.com/b",
+            "publisher": "Desk",
+            "type": "STORY",
+            "thumbnail": None,
+            "published_at": None,
+        },
+    ]
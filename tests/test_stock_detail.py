@@ -1,5 +1,8 @@
 import os
 import sys
+from concurrent.futures import Future
+from types import SimpleNamespace
+from unittest.mock import MagicMock, call, patch
 
 import pytest
 
@@ -10,169 +13,320 @@ if PROJECT_ROOT not in sys.path:
 import app as app_module
 from app import app
 
+LONG_HISTORY = {
+    "symbol": "MSFT",
+    "interval": "1d",
+    "points": [{"date": f"2020-01-{i % 28 + 1:02d}", "close": float(i)} for i in range(600)],
+}
 
-@pytest.fixture()
-def client():
-    app.config["TESTING"] = True
-    with app.test_client() as client:
-        yield client
 
+def _fake_columnar_history(symbol, interval, columnar=False):
+    assert columnar
+    return {"symbol": symbol, "interval": interval, "columns": {"date": ["2024-01-01"], "close": [310.0]}}
 
-def test_stock_detail_page(client):
-    response = client.get("/stocks/AAPL")
-    assert response.status_code == 200
-    assert b"AAPL" in response.data
 
+def _history_through_upstream_cache(monkeypatch, payload):
+    """Serve ``payload`` from a fake stock_api behind a fresh upstream cache; ETags come from its entries."""
+    fake = MagicMock(return_value=payload)
+    monkeypatch.setattr(app_module, "upstream_cache", app_module.SingleFlightCache())
+    monkeypatch.setattr(app_module, "_stock_api_module", lambda: SimpleNamespace(fetch_price_history=fake))
+    return fake
 
-def test_search_returns_matches(client, monkeypatch):
-    sample = [
-        {"id": "1", "symbol": "AAPL", "list_type": "A"},
-        {"id": "2", "symbol": "AMZN", "list_type": "B"},
-        {"id": "3", "symbol": "MSFT", "list_type": "PA"},
-    ]
-    monkeypatch.setattr("app._read_stocks", lambda *args, **kwargs: sample)
 
-    response = client.get("/api/stocks/search?q=a")
-    assert response.status_code == 200
-    data = response.get_json()
-    assert {item["symbol"] for item in data["results"]} >= {"AAPL", "AMZN"}
+def _fake_percent_change(initial, current):
+    if initial in (None, 0) or current is None:
+        return None
+    return ((current - initial) / initial) * 100
 
 
-def test_search_handles_empty_query(client, monkeypatch):
-    monkeypatch.setattr("app._read_stocks", lambda *args, **kwargs: [])
-
-    response = client.get("/api/stocks/search?q=")
+def test_stock_detail_page(client):
+    with patch.object(app_module, "PREFETCH_DETAIL_DATA", False):
+        response = client.get("/stocks/AAPL")
     assert response.status_code == 200
-    data = response.get_json()
-    assert data["results"] == []
-
-
-def test_search_rejects_overlong_query(client):
-    response = client.get("/api/stocks/search?q=" + ("A" * 40))
-    assert response.status_code == 400
-
+    assert b"AAPL" in response.data
 
-def test_history_success(client, monkeypatch):
-    def fake_fetch(symbol, interval):
-        assert symbol == "MSFT"
-        assert interval == "1d"
-        return {"symbol": symbol, "interval": interval, "points": [{"date": "2024-01-01", "close": 310.0}]}
 
-    monkeypatch.setattr("app.fetch_price_history", fake_fetch)
-    response = client.get("/api/stocks/MSFT/history?interval=1d")
-    assert response.status_code == 200
-    data = response.get_json()
-    assert data["points"][0]["close"] == 310.0
+def test_stock_detail_page_prefetches_its_data(client, monkeypatch):
+    loaded = []
+    done = app_module.threading.Event()
+
+    def record(name):
+        def loader(symbol, *args, **kwargs):
+            loaded.append((name, symbol, args, kwargs))
+            if len(loaded) == 3:
+                done.set()
+
+        return loader
+
+    monkeypatch.setitem(app_module._index_state, "by_symbol", {"AAPL": [{"id": "1"}]})
+    monkeypatch.setattr(app_module, "_prefetch_inflight", {})
+    monkeypatch.setattr(app_module, "fetch_overview", record("overview"))
+    monkeypatch.setattr(app_module, "fetch_price_history", record("history"))
+    monkeypatch.setattr(app_module, "fetch_news", record("news"))
+    assert client.get("/stocks/aapl").status_code == 200
+    assert done.wait(timeout=5)
+    assert sorted(loaded) == [
+        ("history", "AAPL", ("1d",), {"columnar": True}),
+        ("news", "AAPL", (), {}),
+        ("overview", "AAPL", (), {}),
+    ]
 
 
-def test_history_invalid_interval(client, monkeypatch):
-    def fake_fetch(symbol, interval):
-        raise ValueError("interval must be 1d or 1wk")
+def test_detail_prefetch_skips_untracked_and_in_flight_symbols(monkeypatch):
+    submitted = []
 
-    monkeypatch.setattr("app.fetch_price_history", fake_fetch)
-    response = client.get("/api/stocks/MSFT/history?interval=5m")
-    assert response.status_code == 400
-    data = response.get_json()
-    assert "error" in data
+    class FakePool:
+        def submit(self, fn, *args, **kwargs):
+            submitted.append(args[0])
+            return Future()
 
+    tracked = {"AMD": [{"id": "1"}], "NVDA": [{"id": "2"}], "GONE": []}
+    monkeypatch.setitem(app_module._index_state, "by_symbol", tracked)
+    monkeypatch.setattr(app_module, "_prefetch_inflight", {})
+    monkeypatch.setattr(app_module, "_prefetch_pool", FakePool())
+    monkeypatch.setattr(app_module, "PREFETCH_MAX_SYMBOLS", 1)
 
-def test_indicators_require_windows(client):
-    response = client.get("/api/stocks/AAPL/indicators?type=sma")
-    assert response.status_code == 400
+    app_module._prefetch_detail_data("ZZZZ")
+    app_module._prefetch_detail_data("GONE")
+    assert submitted == []
+    app_module._prefetch_detail_data("AMD")
+    app_module._prefetch_detail_data("AMD")
+    assert submitted == ["AMD"] * 3
+    app_module._prefetch_detail_data("NVDA")
+    assert submitted == ["AMD"] * 3
 
 
-def test_indicators_invalid_type(client):
-    response = client.get("/api/stocks/AAPL/indicators?type=macd&windows=12")
-    assert response.status_code == 400
+def test_json_provider_handles_api_payloads():
+    with app.app_context():
+        body = app.json.response({"symbol": "AAPL", "counts": {1: 2}, "when": app_module.date(2024, 1, 7)})
+    data = body.get_json()
+    assert data["symbol"] == "AAPL"
+    assert data["counts"] == {"1": 2}
+    assert data["when"]
 
 
-def test_indicators_success(client, monkeypatch):
-    def fake_compute(symbol, interval, windows):
-        assert symbol == "AAPL"
-        assert interval == "1d"
-        assert windows == [20]
-        return {
-            "symbol": symbol,
-            "interval": interval,
-            "indicators": [
-                {
-                    "type": "sma",
-                    "window": 20,
-                    "values": [{"date": "2024-01-01", "value": 150.0}],
-                }
-            ],
-        }
-
-    monkeypatch.setattr("app.compute_sma", fake_compute)
-    response = client.get("/api/stocks/AAPL/indicators?type=sma&interval=1d&windows=20")
+def test_search_returns_matches(client, loads):
+    sample = [
+        {"id": "1", "symbol": "AAPL", "list_type": "A"},
+        {"id": "2", "symbol": "AMZN", "list_type": "B"},
+        {"id": "3", "symbol": "MSFT", "list_type": "PA"},
+    ]
+    with patch.object(app_module, "_read_stocks", lambda *args, **kwargs: sample):
+        response = client.get("/api/stocks/search?q=a")
     assert response.status_code == 200
-    data = response.get_json()
-    assert data["indicators"][0]["window"] == 20
+    data = loads(response.data)
+    assert {item["symbol"] for item in data["results"]} >= {"AAPL", "AMZN"}
 
 
-def test_rsi_requires_valid_period(client):
-    response = client.get("/api/stocks/AAPL/rsi?period=abc")
-    assert response.status_code == 400
-
+def test_search_filters_by_list(client, monkeypatch, loads):
+    sample = [
+        {"id": "1", "symbol": "AAPL", "list_type": "A"},
+        {"id": "2", "symbol": "AMZN", "list_type": "B"},
+        {"id": "3", "symbol": "MSFT", "list_type": "PA"},
+    ]
+    monkeypatch.setattr(app_module, "_read_stocks", lambda *args, **kwargs: sample)
+    monkeypatch.setattr(app_module, "_response_cache", {})
 
-def test_rsi_success(client, monkeypatch):
-    def fake_rsi(symbol, interval, period):
-        assert symbol == "AAPL"
-        assert interval == "1d"
-        assert period == 14
-        return {
-            "symbol": symbol,
-            "interval": interval,
-            "period": period,
-            "values": [{"date": "2024-01-01", "value": 55.0}],
-        }
-
-    monkeypatch.setattr("app.compute_rsi", fake_rsi)
-    response = client.get("/api/stocks/AAPL/rsi?interval=1d&period=14")
+    response = client.get("/api/stocks/search?q=a&list=b")
     assert response.status_code == 200
-    data = response.get_json()
-    assert data["values"][0]["value"] == 55.0
+    data = loads(response.data)
+    assert data["results"] == [{"id": "2", "symbol": "AMZN", "list_type": "B"}]
 
 
-def test_news_invalid_limit(client):
-    response = client.get("/api/stocks/AAPL/news?limit=bad")
-    assert response.status_code == 400
+def test_search_handles_empty_query(client, loads):
+    with patch.object(app_module, "_read_stocks", lambda *args, **kwargs: []):
+        response = client.get("/api/stocks/search?q=")
+    assert response.status_code == 200
+    data = loads(response.data)
+    assert data["results"] == []
 
 
-def test_news_success(client, monkeypatch):
-    def fake_news(symbol, limit=10):
-        assert symbol == "AAPL"
-        assert limit == 5
-        return [
+BAD_REQUESTS = [
+    "/api/stocks/search?q=" + ("A" * 40),
+    "/api/stocks/AAPL/indicators?type=sma",
+    "/api/stocks/AAPL/indicators?type=macd&windows=12",
+    "/api/stocks/AAPL/rsi?period=abc",
+    "/api/stocks/AAPL/news?limit=bad",
+]
+
+GOOD_REQUESTS = [
+    (
+        "/api/stocks/MSFT/history?interval=1d",
+        "fetch_price_history",
+        {"symbol": "MSFT", "interval": "1d", "points": [{"date": "2024-01-01", "close": 310.0}]},
+        call("MSFT", "1d"),
+        lambda data: data["points"][0]["close"] == 310.0,
+    ),
+    (
+        "/api/stocks/AAPL/indicators?type=sma&interval=1d&windows=20",
+        "compute_sma",
+        {
+            "symbol": "AAPL",
+            "interval": "1d",
+            "indicators": [{"type": "sma", "window": 20, "values": [{"date": "2024-01-01", "value": 150.0}]}],
+        },
+        call("AAPL", "1d", [20]),
+        lambda data: data["indicators"][0]["window"] == 20,
+    ),
+    (
+        "/api/stocks/AAPL/rsi?interval=1d&period=14",
+        "compute_rsi",
+        {"symbol": "AAPL", "interval": "1d", "period": 14, "values": [{"date": "2024-01-01", "value": 55.0}]},
+        call("AAPL", "1d", 14),
+        lambda data: data["values"][0]["value"] == 55.0,
+    ),
+]
+
+# Views whose routing is not under test are called directly inside a request context
+DIRECT_VIEWS = [
+    (
+        app_module.get_stock_news,
+        "/api/stocks/AAPL/news?limit=5",
+        "fetch_news",
+        [
             {
                 "title": "Test Article",
                 "link": "https://example.com",
                 "publisher": "Example",
                 "published_at": "2024-01-01T00:00:00",
             }
-        ]
+        ],
+        call("AAPL", limit=5),
+        lambda data: data["articles"][0]["title"] == "Test Article",
+    ),
+    (
+        app_module.get_stock_overview,
+        "/api/stocks/AAPL/overview",
+        "fetch_overview",
+        {"symbol": "AAPL", "longName": "Sample Corp", "last_price": 123.45},
+        call("AAPL"),
+        lambda data: data["longName"] == "Sample Corp",
+    ),
+]
+
+
+@pytest.mark.parametrize("url", BAD_REQUESTS)
+def test_bad_requests(wsgi_get, url):
+    status, body = wsgi_get(url)
+    assert status == 400
+    assert b'"error"' in body
+
+
+@pytest.mark.parametrize("url,helper,payload,expected_call,check", GOOD_REQUESTS)
+def test_endpoint_success(wsgi_get, upstream, url, helper, payload, expected_call, check, loads):
+    fake = getattr(upstream, helper)
+    fake.return_value = payload
+    status, body = wsgi_get(url)
+    assert status == 200
+    assert check(loads(body))
+    assert fake.call_args_list == [expected_call]
+
+
+@pytest.mark.parametrize("view,url,helper,payload,expected_call,check", DIRECT_VIEWS)
+def test_view_success(upstream, view, url, helper, payload, expected_call, check, loads):
+    fake = getattr(upstream, helper)
+    fake.return_value = payload
+    with app.test_request_context(url):
+        response = view("AAPL")
+    assert response.status_code == 200
+    assert check(loads(response.data))
+    assert fake.call_args_list == [expected_call]
+
 
-    monkeypatch.setattr("app.fetch_news", fake_news)
-    response = client.get("/api/stocks/AAPL/news?limit=5")
+def test_history_streams_long_series(client, monkeypatch, loads):
+    _history_through_upstream_cache(monkeypatch, LONG_HISTORY)
+    response = client.get("/api/stocks/MSFT/history?interval=1d")
+    assert response.is_streamed
+    assert loads(response.data) == LONG_HISTORY
+    assert "ETag" in response.headers
+
+
+def test_history_columns_format(client, loads):
+    with patch.object(app_module, "fetch_price_history", _fake_columnar_history):
+        response = client.get("/api/stocks/MSFT/history?interval=1d&format=columns")
+    assert loads(response.data)["columns"]["close"] == [310.0]
+    assert client.get("/api/stocks/MSFT/history?format=arrow").status_code == 400
+
+
+def test_history_revalidates_with_etag(client, monkeypatch):
+    fake = _history_through_upstream_cache(
+        monkeypatch, {"symbol": "MSFT", "interval": "1d", "points": [{"date": "2024-01-01", "close": 310.0}]}
+    )
+    first = client.get("/api/stocks/MSFT/history?interval=1d")
+    etag = first.headers["ETag"]
+
+    # Price refreshes don't touch the bars, so they leave the tag alone
+    app_module.price_cache.prime("MSFT", 311.0)
+    second = client.get("/api/stocks/MSFT/history?interval=1d", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.data == b""
+    fake.assert_called_once_with("MSFT", "1d", columnar=False)
+
+    # Once the cached bars are dropped the old tag no longer vouches for the body
+    app_module.upstream_cache.clear()
+    third = client.get("/api/stocks/MSFT/history?interval=1d", headers={"If-None-Match": etag})
+    assert third.status_code == 200
+    assert fake.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "url,helper,payload",
+    [
+        ("/api/stocks/MSFT/history?interval=1d", "fetch_price_history", {"symbol": "MSFT", "points": []}),
+        ("/api/stocks/AAPL/indicators?type=sma&windows=20", "compute_sma", {"symbol": "AAPL", "indicators": []}),
+        ("/api/stocks/AAPL/rsi?period=14", "compute_rsi", {"symbol": "AAPL", "values": []}),
+    ],
+)
+def test_empty_market_data_is_not_tagged(client, upstream, url, helper, payload):
+    getattr(upstream, helper).return_value = payload
+    response = client.get(url)
     assert response.status_code == 200
-    data = response.get_json()
-    assert data["articles"][0]["title"] == "Test Article"
+    assert "ETag" not in response.headers
+    assert "Cache-Control" not in response.headers
 
 
-def test_overview_success(client, monkeypatch):
-    def fake_overview(symbol):
-        return {"symbol": symbol, "longName": "Sample Corp", "last_price": 123.45}
+def test_history_invalid_interval(upstream, loads):
+    upstream.fetch_price_history.side_effect = ValueError("interval must be 1d or 1wk")
+    with app.test_request_context("/api/stocks/MSFT/history?interval=5m"):
+        response = app_module.get_stock_history("MSFT")
+    assert response.status_code == 400
+    assert loads(response.data) == {"error": "interval must be 1d or 1wk"}
 
-    monkeypatch.setattr("app.fetch_overview", fake_overview)
-    response = client.get("/api/stocks/AAPL/overview")
-    assert response.status_code == 200
-    data = response.get_json()
-    assert data["longName"] == "Sample Corp"
+
+def test_json_error_reuses_encoded_body(loads):
+    response = app_module._json_error("stock not found", 404)
+    assert response.status_code == 404
+    assert response.mimetype == "application/json"
+    assert loads(response.data) == {"error": "stock not found"}
+    assert app_module._error_body("stock not found") is app_module._error_body("stock not found")
+
+
+def test_parse_windows_param_skips_invalid_tokens():
+    assert app_module._parse_windows_param("5, 20 ,abc,-3,0,1a2,,50") == [5, 20, 50]
+    assert app_module._parse_windows_param("") == []
+
+
+def test_repeated_indicator_queries_reuse_computed_payload(monkeypatch):
+    calls = []
+
+    class FakeStockApi:
+        @staticmethod
+        def compute_sma(symbol, interval, windows):
+            calls.append((symbol, interval, windows))
+            return {"symbol": symbol, "interval": interval, "indicators": [{"window": w} for w in windows]}
+
+    monkeypatch.setattr(app_module, "upstream_cache", app_module.SingleFlightCache())
+    monkeypatch.setattr(app_module, "_stock_api_module", lambda: FakeStockApi)
+    first = app_module.compute_sma("AAPL", "1d", [20, 50])
+    assert app_module.compute_sma("AAPL", "1d", (20, 50)) is first
+    app_module.compute_sma("AAPL", "1d", [50, 20])
+    assert calls == [("AAPL", "1d", (20, 50)), ("AAPL", "1d", (50, 20))]
 
 
-def test_snapshot_returns_latest_entry(client, monkeypatch):
+def test_snapshot_returns_latest_entry(client, monkeypatch, loads):
     monkeypatch.setitem(app_module._index_state, "by_symbol", {})
     monkeypatch.setitem(app_module._index_state, "by_id", {})
+    monkeypatch.setattr(app_module, "_response_cache", {})
     sample = [
         {
             "id": "1",
@@ -192,30 +346,105 @@ def test_snapshot_returns_latest_entry(client, monkeypatch):
         },
     ]
 
-    monkeypatch.setattr("app._read_stocks", lambda *args, **kwargs: sample)
-    monkeypatch.setattr("app.get_current_prices", lambda symbols: {symbols[0]: 150.0})
-
-    def fake_percent_change(initial, current):
-        if initial in (None, 0) or current is None:
-            return None
-        return ((current - initial) / initial) * 100
-
-    monkeypatch.setattr("app.calculate_percent_change", fake_percent_change)
+    cache = app_module.PriceCache(ttl_seconds=60)
+    cache.prime("AAPL", 150.0)
+    monkeypatch.setattr(app_module, "price_cache", cache)
+    monkeypatch.setattr(app_module, "_read_stocks", lambda *args, **kwargs: sample)
+    monkeypatch.setattr(app_module, "calculate_percent_change", _fake_percent_change)
 
     response = client.get("/api/stocks/AAPL/snapshot")
     assert response.status_code == 200
-    data = response.get_json()
+    data = loads(response.data)
     assert data["initial_price"] == 130.0
     assert data["current_price"] == 150.0
     assert pytest.approx(data["percent_change"], rel=1e-6) == ((150.0 - 130.0) / 130.0) * 100
     assert data["list_type"] == "B"
+    assert "stale-while-revalidate" in response.headers["Cache-Control"]
+
+    etag = response.headers["ETag"]
+    assert client.get("/api/stocks/AAPL/snapshot", headers={"If-None-Match": etag}).status_code == 304
+    cache.prime("AAPL", 160.0)
+    refreshed = client.get("/api/stocks/AAPL/snapshot", headers={"If-None-Match": etag})
+    assert loads(refreshed.data)["current_price"] == 160.0
+
+
+def test_snapshot_does_not_wait_for_upstream(client, monkeypatch, loads):
+    monkeypatch.setitem(app_module._index_state, "by_symbol", {})
+    monkeypatch.setitem(app_module._index_state, "by_id", {})
+    monkeypatch.setattr(app_module, "_response_cache", {})
+    monkeypatch.setattr(
+        "app._read_stocks",
+        lambda *args, **kwargs: [{"id": "1", "symbol": "AMD", "initial_price": 10.0, "list_type": "A"}],
+    )
+    cache = app_module.PriceCache(ttl_seconds=60)
+    monkeypatch.setattr(cache, "_ensure_worker_locked", lambda: None)
+    monkeypatch.setattr(app_module, "price_cache", cache)
+
+    data = loads(client.get("/api/stocks/AMD/snapshot").data)
+    assert data["current_price"] is None
+    assert cache._pending == {"AMD"}
+
+
+@pytest.mark.parametrize("threshold", [256, 0])
+def test_prices_include_every_row(client, monkeypatch, threshold, loads):
+    sample = [
+        {"id": "1", "symbol": "AAPL", "initial_price": 100.0, "list_type": "A"},
+        {"id": "2", "symbol": "AAPL", "initial_price": 200.0, "list_type": "B"},
+        {"id": "3", "symbol": "MSFT", "initial_price": None, "list_type": "PA"},
+    ]
+    cache = app_module.PriceCache(ttl_seconds=60)
+    monkeypatch.setattr(cache, "_ensure_worker_locked", lambda: None)
+    monkeypatch.setattr(app_module, "price_cache", cache)
+    monkeypatch.setattr(app_module, "_response_cache", {})
+    monkeypatch.setattr(app_module, "PRICES_INCREMENTAL_THRESHOLD", threshold)
+    monkeypatch.setattr(app_module, "_read_stocks", lambda *args, **kwargs: sample)
+    monkeypatch.setattr(app_module, "get_current_prices", lambda symbols: {"AAPL": 150.0, "MSFT": 300.0})
+
+    response = client.get("/api/stocks/prices")
+    assert response.status_code == 200
+    data = loads(response.data)
+    assert [(row["id"], row["current_price"], row["percent_change"]) for row in data] == [
+        ("1", 150.0, 50.0),
+        ("2", 150.0, -25.0),
+        ("3", 300.0, None),
+    ]
+
+
+def test_cached_prices_parse_symbol_list(client, monkeypatch, loads):
+    cache = app_module.PriceCache(ttl_seconds=60)
+    monkeypatch.setattr(cache, "_ensure_worker_locked", lambda: None)
+    monkeypatch.setattr(app_module, "price_cache", cache)
+    monkeypatch.setattr(app_module, "get_current_prices", lambda symbols: {sym: 1.0 for sym in symbols})
+
+    response = client.get("/api/prices?symbols=aapl,%20msft,,^gspc,AAPL")
+    assert response.status_code == 200
+    assert list(loads(response.data)["prices"]) == ["AAPL", "MSFT", "^GSPC"]
+
+    cache.prime("AAPL", 2.0)
+    refreshed = client.get("/api/prices?symbols=aapl,%20msft,,^gspc,AAPL")
+    assert loads(refreshed.data)["prices"]["AAPL"] == 2.0
+    assert refreshed.headers["ETag"] != response.headers["ETag"]
+    revalidated = client.get(
+        "/api/prices?symbols=aapl,%20msft,,^gspc,AAPL", headers={"If-None-Match": refreshed.headers["ETag"]}
+    )
+    assert revalidated.status_code == 304
+
+
+def test_etag_token_hashes_sequences_like_joined_strings():
+    assert app_module._make_etag_token(3, "prices", ["AAPL", "MSFT"]) == app_module._make_etag_token(
+        3, "prices", "AAPL,MSFT"
+    )
+    assert app_module._make_etag_token(3, "prices", ["AAPL"]) != app_module._make_etag_token(3, "prices", ["MSFT"])
+    assert app_module._make_etag_token("history", "MSFT", "1d", 7) == "history:MSFT:1d:7"
+    assert '"' not in app_module._make_etag_token("history", "MSFT", '1"d', 7)
 
 
-def test_snapshot_not_found(client, monkeypatch):
+def test_snapshot_not_found(client, monkeypatch, loads):
     monkeypatch.setitem(app_module._index_state, "by_symbol", {})
     monkeypatch.setitem(app_module._index_state, "by_id", {})
-    monkeypatch.setattr("app._read_stocks", lambda *args, **kwargs: [])
+    monkeypatch.setattr(app_module, "_response_cache", {})
+    monkeypatch.setattr(app_module, "_read_stocks", lambda *args, **kwargs: [])
     response = client.get("/api/stocks/TSLA/snapshot")
     assert response.status_code == 404
-    data = response.get_json()
+    data = loads(response.data)
     assert "error" in data
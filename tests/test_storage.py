@@ -0,0 +1,235 @@
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import app as app_module
+
+
+def test_list_records_reflect_rewrites(data_root):
+    week = "2024-01-07"
+    app_module._save_list_records(week, "A", [{"id": "1", "symbol": "AAPL"}])
+    assert [r["symbol"] for r in app_module._load_list_records(week, "A")] == ["AAPL"]
+
+    app_module._save_list_records(week, "A", [{"id": "1", "symbol": "AAPL"}, {"id": "2", "symbol": "MSFT"}])
+    assert [r["symbol"] for r in app_module._load_list_records(week, "A")] == ["AAPL", "MSFT"]
+
+
+def test_list_records_missing_file(data_root):
+    assert app_module._load_list_records("2024-01-07", "PB") == []
+
+
+def test_index_round_trip(data_root):
+    state = app_module._default_index()
+    state["latest_week"] = "2024-01-07"
+    state["state_version"] = 3
+    app_module._save_index(state)
+    loaded = app_module._load_index()
+    assert loaded["latest_week"] == "2024-01-07"
+    assert loaded["state_version"] == 3
+
+
+def test_list_records_served_from_memory(data_root):
+    week = "2024-01-07"
+    app_module._save_list_records(week, "B", [{"id": "1", "symbol": "NVDA"}])
+    os.remove(app_module._list_file_path(week, "B"))
+    assert [r["symbol"] for r in app_module._load_list_records(week, "B")] == ["NVDA"]
+
+
+def test_stocks_response_tracks_mutations(client):
+    payload = {"symbol": "amd", "initial_price": 100, "date_spotted": "2024-01-03", "list_type": "A"}
+    created = client.post("/api/stocks", json=payload).get_json()["stock"]
+
+    first = client.get("/api/stocks?week=2024-01-07")
+    assert [row["symbol"] for row in first.get_json()["A"]] == ["AMD"]
+    second = client.get("/api/stocks?week=2024-01-07")
+    assert second.get_json() == first.get_json()
+    assert second.headers["ETag"] == first.headers["ETag"]
+    revalidated = client.get("/api/stocks?week=2024-01-07", headers={"If-None-Match": first.headers["ETag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.data == b""
+
+    assert client.delete(f"/api/stocks/{created['id']}").status_code == 200
+    after = client.get("/api/stocks?week=2024-01-07")
+    assert after.get_json()["A"] == []
+    assert after.headers["ETag"] != first.headers["ETag"]
+
+
+def test_index_record_keeps_symbol_entries_sorted(data_root):
+    app_module._index_record({"id": "b", "symbol": "AAPL", "date_added": "2024-02-01"}, "2024-02-04", "A")
+    app_module._index_record({"id": "a", "symbol": "AAPL", "date_added": "2024-01-02"}, "2024-01-07", "A")
+    app_module._index_record({"id": "c", "symbol": "AAPL", "date_added": "2024-03-01"}, "2024-03-03", "B")
+    assert [e["id"] for e in app_module._index_state["by_symbol"]["AAPL"]] == ["a", "b", "c"]
+
+    app_module._index_record({"id": "a", "symbol": "AAPL", "date_added": "2024-04-01"}, "2024-04-07", "A")
+    assert [e["id"] for e in app_module._index_state["by_symbol"]["AAPL"]] == ["b", "c", "a"]
+
+    app_module._index_record({"id": "b", "symbol": "MSFT", "date_added": "2024-02-01"}, "2024-02-04", "A")
+    assert [e["id"] for e in app_module._index_state["by_symbol"]["AAPL"]] == ["c", "a"]
+    assert [e["id"] for e in app_module._index_state["by_symbol"]["MSFT"]] == ["b"]
+
+    app_module._remove_index_entry("c")
+    assert [e["id"] for e in app_module._index_state["by_symbol"]["AAPL"]] == ["a"]
+
+
+def test_deleted_symbols_are_no_longer_warmed(data_root):
+    app_module._upsert_record({"symbol": "AMD", "date_spotted": "2024-01-03", "list_type": "A"})
+    gone = app_module._upsert_record({"symbol": "NVDA", "date_spotted": "2024-01-03", "list_type": "A"})
+    assert sorted(app_module._tracked_symbols()) == ["AMD", "NVDA"]
+
+    assert app_module._delete_record(gone["id"])
+    assert app_module._tracked_symbols() == ["AMD"]
+    cache = app_module.PriceCache(ttl_seconds=60, warm_symbols=app_module._tracked_symbols, warm_interval=60)
+    cache._queue_warm_symbols()
+    assert cache._pending == {"AMD"}
+
+    app_module._flush_index()
+    assert "NVDA" not in app_module._load_index()["by_symbol"]
+
+
+def test_mutations_flush_index(data_root):
+    stored = app_module._upsert_record({"symbol": "TSLA", "date_spotted": "2024-01-03", "list_type": "PA"})
+    app_module._flush_index()
+    assert not app_module._index_dirty.is_set()
+    loaded = app_module._load_index()
+    assert loaded["by_id"][stored["id"]]["list"] == "PA"
+
+
+def test_rebuild_skips_folders_that_are_not_weeks(data_root):
+    app_module._save_list_records("2024-01-07", "A", [{"id": "1", "symbol": "AAPL"}])
+    (data_root / "history").mkdir()
+    app_module._index_state["latest_week"] = "history"
+
+    assert app_module._rebuild_index_from_files()
+    assert list(app_module._index_state["weeks"]) == ["2024-01-07"]
+    assert app_module._index_state["latest_week"] == "2024-01-07"
+
+
+def test_startup_rebuilds_an_index_that_lags_the_list_files(data_root, monkeypatch):
+    stored = app_module._upsert_record({"symbol": "AMD", "date_spotted": "2024-01-03", "list_type": "A"})
+    app_module._flush_index()
+    rebuilds = []
+    rebuild = app_module._rebuild_index_from_files
+    monkeypatch.setattr(app_module, "_rebuild_index_from_files", lambda: rebuilds.append(1) or rebuild())
+
+    app_module._records.clear()
+    app_module._index_state.update(app_module._load_index())
+    app_module._initialize_storage()
+    assert rebuilds == []
+
+    # The list file gained a row whose index flush never happened
+    week = stored["week_end"]
+    app_module._save_list_records(week, "B", [{"id": "late", "symbol": "NVDA", "date_spotted": "2024-01-04"}])
+    app_module._records.clear()
+    app_module._index_state.update(app_module._load_index())
+    app_module._initialize_storage()
+    assert rebuilds == [1]
+    assert app_module._index_state["by_id"]["late"]["list"] == "B"
+    assert app_module._index_state["weeks"][week]["lists"]["B"]["count"] == 1
+    assert app_module._load_index()["by_id"]["late"]["symbol"] == "NVDA"
+
+
+def test_app_imports_into_empty_data_directory(tmp_path):
+    env = dict(os.environ, STOCKS_PATH=str(tmp_path / "fresh"))
+    result = subprocess.run(
+        [sys.executable, "-c", "import app"], cwd=PROJECT_ROOT, env=env, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    assert (tmp_path / "fresh" / "index.json").exists()
+
+
+def test_parse_weeks_param_expands_ranges():
+    assert app_module._parse_weeks_param("2024-01-03..2024-01-20") == ["2024-01-07", "2024-01-14", "2024-01-21"]
+    assert app_module._parse_weeks_param("2024-01-20:2024-01-03,2024-01-07") == ["2024-01-07", "2024-01-14", "2024-01-21"]
+
+
+def test_grouped_lists_serve_rows_the_index_count_missed(data_root):
+    week = "2024-01-07"
+    app_module._ensure_week_entry(week)
+    app_module._save_list_records(week, "PB", [{"id": "1", "symbol": "AMD"}])
+    assert app_module._index_state["weeks"][week]["lists"]["PB"]["count"] == 0
+    assert [r["symbol"] for r in app_module._load_grouped_lists([week])["PB"]] == ["AMD"]
+    assert app_module._load_grouped_lists([week])["A"] == []
+
+
+def test_snapshot_uses_latest_spotted_entry(client, monkeypatch):
+    cache = app_module.PriceCache(ttl_seconds=60)
+    monkeypatch.setattr(cache, "_ensure_worker_locked", lambda: None)
+    monkeypatch.setattr(app_module, "price_cache", cache)
+    app_module._upsert_record({"id": "new", "symbol": "NFLX", "initial_price": 20.0, "date_spotted": "2024-03-01"})
+    app_module._upsert_record({"id": "old", "symbol": "NFLX", "initial_price": 10.0, "date_spotted": "2024-01-03"})
+
+    data = client.get("/api/stocks/NFLX/snapshot").get_json()
+    assert data["id"] == "new"
+    assert data["initial_price"] == 20.0
+
+
+def test_find_list_record_follows_rewrites(data_root):
+    week = "2024-01-07"
+    app_module._save_list_records(week, "A", [{"id": "1", "symbol": "AAPL"}])
+    assert app_module._find_list_record(week, "A", 1)["symbol"] == "AAPL"
+
+    app_module._save_list_records(week, "A", [{"id": "1", "symbol": "AMD"}])
+    assert app_module._find_list_record(week, "A", "1")["symbol"] == "AMD"
+    assert app_module._find_list_record(week, "A", "2") is None
+
+
+def test_index_entries_share_interned_strings(data_root):
+    week = "".join(["2024-01-", "07"])
+    app_module._index_record({"id": "1", "symbol": "aapl", "date_added": "2024-01-02"}, week, "A")
+    app_module._save_index(app_module._index_state)
+
+    loaded = app_module._load_index()
+    assert loaded["by_id"]["1"]["week"] is loaded["by_symbol"]["AAPL"][0]["week"]
+    assert loaded["by_id"]["1"]["week"] is app_module._index_state["by_id"]["1"]["week"]
+
+
+def test_weeks_response_tracks_new_weeks(client):
+    first = client.get("/api/weeks")
+    assert client.get("/api/weeks").headers["ETag"] == first.headers["ETag"]
+
+    client.post("/api/stocks", json={"symbol": "amd", "initial_price": 1, "date_spotted": "2024-01-03"})
+    after = client.get("/api/weeks")
+    assert "2024-01-07" in [week["week_end"] for week in after.get_json()]
+    assert after.headers["ETag"] != first.headers["ETag"]
+
+
+def test_update_stock_replaces_shared_record(client):
+    created = client.post("/api/stocks", json={"symbol": "amd", "initial_price": 1, "date_spotted": "2024-01-03"})
+    stock = created.get_json()["stock"]
+    before = app_module._get_stock_by_id(stock["id"])[1]
+
+    updated = client.put(f"/api/stocks/{stock['id']}", json={"initial_price": 2}).get_json()
+    assert updated["initial_price"] == 2.0
+    assert before["initial_price"] == 1.0
+    assert app_module._get_stock_by_id(stock["id"])[1]["initial_price"] == 2.0
+
+
+def test_unchanged_update_skips_rewrite(data_root, monkeypatch):
+    stored = app_module._upsert_record({"symbol": "AMD", "initial_price": 1.0, "date_spotted": "2024-01-03"})
+    version = app_module.state_version
+    writes = []
+    monkeypatch.setattr(app_module, "_save_list_records", lambda *args: writes.append(args))
+
+    assert app_module._upsert_record(dict(stored), previous=app_module._index_state["by_id"][stored["id"]]) == stored
+    assert writes == []
+    assert app_module.state_version == version
+
+
+def test_large_list_files_are_read_through_mmap(data_root, monkeypatch):
+    week = "2024-01-07"
+    app_module._save_list_records(week, "A", [{"id": "1", "symbol": "AAPL"}, {"id": "2", "symbol": "MSFT"}])
+    monkeypatch.setattr(app_module, "MMAP_READ_THRESHOLD_BYTES", 0)
+    assert [r["symbol"] for r in app_module._read_list_file(week, "A")] == ["AAPL", "MSFT"]
+
+
+def test_remove_record_uses_id_map(data_root):
+    week = "2024-01-07"
+    app_module._save_list_records(week, "A", [{"id": "1", "symbol": "AAPL"}, {"id": 2, "symbol": "MSFT"}])
+    assert not app_module._remove_record_from_file(week, "A", "3")
+    assert app_module._remove_record_from_file(week, "A", "2")
+    assert [r["symbol"] for r in app_module._load_list_records(week, "A")] == ["AAPL"]
+    assert app_module._find_list_record(week, "A", "2") is None